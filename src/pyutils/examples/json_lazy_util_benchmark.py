@@ -0,0 +1,86 @@
+import json
+import os
+import re
+import tempfile
+import timeit
+import tracemalloc
+
+from pyutils.json_lazy_util import *
+
+# export of wide records: a few fields are read.
+# The lazy views trade time for memory: the file is scanned in Python, only the selected members are decoded.
+records = [
+    {
+        "id": i,
+        "name_first": f"first{i}",
+        "name_last": f"last{i}",
+        "payload": {"text": "x" * 200, "values": list(range(20))},
+        "history": [{"ts": 1700000000 + j, "event": "update"} for j in range(10)],
+    }
+    for i in range(20_000)
+]
+template = {"id": None, re.compile(r"name_.*"): None}
+
+# malformed structure is reported as by json.loads (positions are byte offsets)
+for doc in (b'[{"id": 1} {"id": 2}]', b'{"id" 1}', b'{"id": 1,}', b'[1, tru]', b'{"id": 1} x'):
+    try:
+        loads_json_lazy(doc)
+    except json.JSONDecodeError as e:
+        print(f"{doc!r:24} {e}")
+    else:
+        raise AssertionError(doc)
+
+fd, path = tempfile.mkstemp(suffix=".json")
+with os.fdopen(fd, "w") as f:
+    json.dump(records, f)
+del records
+
+def full_load():
+    with open(path, "rb") as f:
+        data = json.load(f)
+    return [{k: v for k, v in r.items() if k == "id" or k.startswith("name_")} for r in data]
+
+def lazy_load():
+    with load_json_lazy(path, template=template) as view:
+        return [view[i] for i in range(len(view))]
+
+def lazy_query():
+    with load_json_lazy(path) as view:
+        return view.query("[12345].history[3].ts")
+
+try:
+    assert full_load() == lazy_load()
+    print(f"{os.path.getsize(path)} bytes, {len(lazy_load())} records")
+    print(f"lazy_load()[0] = {lazy_load()[0]}")
+    print(f"lazy_query() = {lazy_query()}")
+
+    for name, load in (
+        ("json.load + select fields", full_load),
+        ("load_json_lazy(template)", lazy_load),
+        ("load_json_lazy().query()", lazy_query),
+    ):
+        t = min(timeit.repeat(load, number=1, repeat=3))
+        # traced separately: tracemalloc slows down the allocations
+        tracemalloc.start()
+        load()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:28} {t * 1000:8.2f} ms  peak {peak / 2**20:7.2f} MiB")
+finally:
+    os.unlink(path)
+
+# ---- Output:
+
+"""
+b'[{"id": 1} {"id": 2}]' Expecting ',' delimiter: line 1 column 12 (byte 11)
+b'{"id" 1}'              Expecting ':' delimiter: line 1 column 7 (byte 6)
+b'{"id": 1,}'            Expecting property name enclosed in double quotes: line 1 column 10 (byte 9)
+b'[1, tru]'              Expecting value: line 1 column 5 (byte 4)
+b'{"id": 1} x'           Extra data: line 1 column 11 (byte 10)
+15546670 bytes, 20000 records
+lazy_load()[0] = {'id': 0, 'name_first': 'first0', 'name_last': 'last0'}
+lazy_query() = 1700000003
+json.load + select fields      283.55 ms  peak  104.24 MiB
+load_json_lazy(template)      2265.69 ms  peak    9.93 MiB
+load_json_lazy().query()       376.80 ms  peak    0.33 MiB
+"""
@@ -0,0 +1,55 @@
+import json
+import re
+import timeit
+
+from pyutils.json_util import *
+
+# measure BaseIndentJSONEncoder, not an accelerated backend (see json_util_backends_parity.py)
+set_json_backend("stdlib")
+
+# as_json() before BaseIndentJSONEncoder: serialize, then rewrite the whole string twice
+def as_json_rewrite(obj, base_indent=0, indent=2):
+    json_str = json.dumps(obj, indent=indent, default=obj2JSON)
+    if base_indent>0:
+        json_str = json_str.replace(f"\n{' '*indent}",f"\n{' '*(base_indent+indent)}")
+        new_line_only_re = r"\n([^\s\n])"
+        new_line_only_base_indent_re = rf"\n{' '*(base_indent)}\1"
+        json_str = re.sub(new_line_only_re, new_line_only_base_indent_re, json_str)
+    return json_str
+
+def deep_doc(depth, width):
+    if depth == 0:
+        return {"id": 1, "name": "leaf", "score": 0.5, "tags": ["a", "b"]}
+    return {f"node_{i}": deep_doc(depth - 1, width) for i in range(width)}
+
+def chain_doc(depth):
+    doc = {"leaf": [1, 2, 3]}
+    for i in range(depth):
+        doc = {"level": i, "items": [doc, "x" * 20]}
+    return doc
+
+docs = {
+    "deep (depth 12, width 2)": deep_doc(12, 2),
+    "deep (depth 6, width 4)": deep_doc(6, 4),
+    "chain (depth 300)": chain_doc(300),
+}
+
+for base_indent in (0, 4):
+    for name, doc in docs.items():
+        assert as_json(doc, base_indent=base_indent) == as_json_rewrite(doc, base_indent=base_indent)
+
+        t_rewrite = min(timeit.repeat(lambda: as_json_rewrite(doc, base_indent=base_indent), number=5, repeat=3))
+        t_single = min(timeit.repeat(lambda: as_json(doc, base_indent=base_indent), number=5, repeat=3))
+        size = len(as_json(doc, base_indent=base_indent))
+        print(f"base_indent={base_indent} {name:28} {size:>9} chars  rewrite: {t_rewrite*200:8.2f} ms  single pass: {t_single*200:8.2f} ms  ({t_rewrite/t_single:.2f}x)")
+
+# ---- Output:
+
+"""
+base_indent=0 deep (depth 12, width 2)       1486830 chars  rewrite:   116.94 ms  single pass:   123.38 ms  (0.95x)
+base_indent=0 deep (depth 6, width 4)         867882 chars  rewrite:    52.19 ms  single pass:    52.63 ms  (0.99x)
+base_indent=0 chain (depth 300)              1104229 chars  rewrite:    84.04 ms  single pass:    96.96 ms  (0.87x)
+base_indent=4 deep (depth 12, width 2)       1667042 chars  rewrite:   141.32 ms  single pass:   109.16 ms  (1.29x)
+base_indent=4 deep (depth 6, width 4)        1026254 chars  rewrite:    76.54 ms  single pass:    64.78 ms  (1.18x)
+base_indent=4 chain (depth 300)              1111453 chars  rewrite:   103.65 ms  single pass:    76.68 ms  (1.35x)
+"""
@@ -0,0 +1,53 @@
+import datetime
+import json
+import timeit
+
+from pyutils.inspect_util import json_schema
+from pyutils.json_util import *
+
+# homogeneous log records
+records = [
+    {
+        "ts": 1700000000 + i,
+        "level": "INFO" if i % 10 else "ERROR",
+        "message": f"request {i} served",
+        "latency": 0.25 + i % 7,
+        "status": 200,
+        "tags": ["api", "v2"],
+        "user": {"id": i, "name": f"user{i}"},
+        "error": None,
+    }
+    for i in range(50_000)
+]
+
+schema = json_schema(records[:100])["items"]
+encode = compile_json_encoder(schema)
+
+# values not matching the schema take the generic path: same output as to_json()
+odd = [
+    dict(records[0], latency=float("nan")),
+    dict(records[0], ts=datetime.date(2024, 1, 1)),
+    dict(records[0], extra="x"),
+    {"message": "other key order", "ts": 1},
+]
+for record in records[:1000] + odd:
+    assert encode(record) == to_json(record)
+
+print(encode(odd[1]))
+
+for name, dumps in (
+    ("json.dumps(default=obj2JSON)", lambda r: json.dumps(r, default=obj2JSON)),
+    (f"to_json ({get_json_backend()})", to_json),
+    ("compile_json_encoder", encode),
+):
+    t = min(timeit.repeat(lambda: [dumps(r) for r in records], number=1, repeat=3))
+    print(f"{name:32} {t * 1e6 / len(records):6.2f} us/record")
+
+# ---- Output:
+
+"""
+{"ts": "2024-01-01", "level": "ERROR", "message": "request 0 served", "latency": 0.25, "status": 200, "tags": ["api", "v2"], "user": {"id": 0, "name": "user0"}, "error": null}
+json.dumps(default=obj2JSON)       6.24 us/record
+to_json (orjson)                   4.85 us/record
+compile_json_encoder               3.20 us/record
+"""
@@ -0,0 +1,43 @@
+import html
+import timeit
+
+from pyutils.markdown_util import *
+
+# HTML renderer with a costly code highlighter (stand-in for Pygments / KaTeX)
+def highlight(code):
+    lines = code.split("\n")
+    return "<pre>" + "\n".join(f"<span class=\"l\">{html.escape(line)}</span>" for line in lines for _ in range(20))[:len(code) * 40] + "</pre>"
+
+renders_map = {
+    "text": lambda md, data: data._add_to_paragraph(html.escape(md)),
+    "code": lambda md, data: data._add_paragraph(highlight(md)),
+    "full_math": lambda latex, data: data._add_paragraph(f"<div class=\"math\">{data._apply_filters(latex)}</div>"),
+    "inline_math": lambda latex, data: data._add_to_paragraph(f"<i>{data._apply_filters(latex)}</i>"),
+}
+
+# chat history re-rendered on every turn: most blocks are unchanged
+message = "Text with math $a \\le b$ and $\\boxed{x_1}$.\n\n```python\n" + "x = compute(x)\n" * 30 + "```\n\n$$\\sum_i x_i$$\n\n"
+history = [message.replace("x_1", f"x_{i % 5}") for i in range(200)]
+
+plain = InlineMathMarkdown2HtmlRenderer(renders_map, None)
+cache = BlockCache(max_bytes=1024 * 1024)
+cached = InlineMathMarkdown2HtmlRenderer(renders_map, None, block_cache=cache)
+assert [cached(md) for md in history] == [plain(md) for md in history]
+
+for name, renderer in (("no cache", plain), ("block cache", cached)):
+    t = min(timeit.repeat(lambda: [renderer(md) for md in history], number=1, repeat=3))
+    print(f"{name:12} {len(history)} messages: {t * 1000:8.2f} ms")
+print(cache)
+
+small = BlockCache(max_bytes=4096)
+InlineMathMarkdown2HtmlRenderer(renders_map, None, block_cache=small).render_many(history)
+print(small)
+
+# ---- Output:
+
+"""
+no cache     200 messages:    41.09 ms
+block cache  200 messages:     7.13 ms
+BlockCache(entries=12, bytes=19152, hits=7188, misses=12, evictions=0)
+BlockCache(entries=11, bytes=597, hits=1589, misses=211, evictions=0)
+"""
@@ -0,0 +1,33 @@
+import timeit
+
+from pyutils.markdown_util import *
+
+# chat history restored from a session
+message = "Some text with inline math $a \\le b$ and more words.\n\n```python\nx = 1\n```\n\n$$\\sum_i x_i$$\n\n"
+history = [message * (1 + i % 50) for i in range(2000)]
+
+renderer = InlineMathMarkdownRenderer()
+expected = [InlineMathMarkdownRenderer()(md) for md in history]
+
+for name, kwargs in (
+    ("calling thread", {}),
+    ("thread pool (4)", {"workers": 4, "executor": "thread"}),
+    ("process pool (4)", {"workers": 4, "executor": "process", "chunk_size": 100}),
+):
+    assert renderer.render_many(history, **kwargs) == expected
+    t = min(timeit.repeat(lambda: renderer.render_many(history, **kwargs), number=1, repeat=3))
+    print(f"render_many {name:18} {len(history)} docs: {t * 1000:8.2f} ms")
+
+# one large document: list buffers joined once
+large = message * 20000
+t = min(timeit.repeat(lambda: renderer(large), number=1, repeat=3))
+print(f"single document {len(large)} chars: {t * 1000:8.2f} ms")
+
+# ---- Output:
+
+"""
+render_many calling thread     2000 docs:  1161.04 ms
+render_many thread pool (4)    2000 docs:  1141.02 ms
+render_many process pool (4)   2000 docs:   994.32 ms
+single document 1820000 chars:   430.30 ms
+"""
@@ -2,6 +2,17 @@
 
 import sys, importlib
 
+_reload_hooks = []
+
+def register_reload_hook(hook):
+    """
+    Register a hook called as hook(module) after refresh_func() reloads a module
+    (e.g. to drop caches holding objects of the old module).
+    Can be used as a decorator.
+    """
+    _reload_hooks.append(hook)
+    return hook
+
 def refresh_func(func):
     """
     Refresh a function by reloading its module.
@@ -10,4 +21,6 @@ def refresh_func(func):
     """
     module = sys.modules[func.__module__]
     importlib.reload(module)
+    for hook in _reload_hooks:
+        hook(module)
     return getattr(module, func.__name__)
@@ -35,30 +35,113 @@ That’s basically runtime structural typing → JSON Schema.
 """
 
 import inspect
+import sys
 
 def here():
     """Return the name of the calling function."""
     return inspect.currentframe().f_back.f_code.co_name
 
 def inspectObjFunctions(obj):
-    """Return the list of functions in the object."""
-    l = []
-    for name, fn in inspect.getmembers(obj, predicate=callable):
-        try:
-            sig = inspect.signature(fn)
-            l.append(f"{name}{sig}")
-        except ValueError:
-            l.append(name)
-    return l
+    """Return the list of functions in the object (see iterObjFunctions())."""
+    return list(iterObjFunctions(obj))
 
 def inspectObjInstData(obj):
-    """Return the list of instance data in the object."""
-    l = []
-    for name, value in inspect.getmembers(obj):
-        if name in getattr(obj, "__dict__", {}):
-            #print(f"{name} = {value}")    
-            l.append(name)
-    return l
+    """Return the list of instance data in the object (see iterObjInstData())."""
+    return list(iterObjInstData(obj))
+
+def iterObjFunctions(obj, predicate=None):
+    """
+    Yield the functions in the object as "name(signature)" (or "name" if it has no signature), sorted by name.
+    Lazy: members are fetched and signatures formatted on demand, so a prefix or a subset
+    (predicate(name) → bool, tested before fetching the member) costs only what it yields.
+
+    Signatures are cached per class (per module / class for modules and classes),
+    and dropped when import_util.refresh_func() reloads their module.
+    """
+    signatures = _signature_cache_of(obj)
+    for name in sorted(dir(obj)):
+        if predicate is not None and not predicate(name):
+            continue
+        try:
+            fn = getattr(obj, name)
+        except AttributeError:
+            continue
+        if not callable(fn):
+            continue
+        yield _member_signature(signatures, name, fn)
+
+def iterObjInstData(obj, predicate=None):
+    """Yield the names of the instance data in the object, sorted by name (lazy, see iterObjFunctions())."""
+    data = getattr(obj, "__dict__", {})
+    for name in sorted(dir(obj)):
+        if name in data and (predicate is None or predicate(name)):
+            yield name
+
+# ======== Signature cache ===============
+
+import types
+import weakref
+
+from pyutils.import_util import register_reload_hook
+
+_signature_caches = weakref.WeakKeyDictionary()     # class / module → {name: (weak member key, text)}
+
+def _signature_cache_of(obj):
+    owner = obj if isinstance(obj, (type, types.ModuleType)) else type(obj)
+    try:
+        cache = _signature_caches.get(owner)
+    except TypeError:
+        # not weak-referenceable: no cache
+        return {}
+    if cache is None:
+        cache = _signature_caches[owner] = {}
+    return cache
+
+def _member_key(fn):
+    """Return a key identifying the signature of a member (bound methods are new objects on every access)."""
+    func = getattr(fn, "__func__", None)
+    if func is not None:
+        return (func, "bound")
+    owner = getattr(fn, "__self__", None)
+    if owner is not None and not isinstance(owner, types.ModuleType):
+        # builtin bound method / method-wrapper: by method type and owner type
+        return (type(fn), type(owner))
+    return fn
+
+def _weak_key(key):
+    """
+    Return the member key with weak references to its parts, so the cached signatures do not keep the class alive
+    (e.g. through the __class__ cell of methods calling super()). Weak references compare equal while alive.
+    """
+    parts = key if isinstance(key, tuple) else (key,)
+    return tuple(_weak_part(part) for part in parts)
+
+def _weak_part(part):
+    try:
+        return weakref.ref(part)
+    except TypeError:
+        # strings, builtin functions: do not reference classes
+        return part
+
+def _member_signature(signatures, name, fn):
+    """Return "name(signature)", cached by member name and member key."""
+    key = _weak_key(_member_key(fn))
+    cached = signatures.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        text = f"{name}{inspect.signature(fn)}"
+    except ValueError:
+        text = name
+    signatures[name] = (key, text)
+    return text
+
+@register_reload_hook
+def _drop_signature_caches(module):
+    """Drop the signature caches of a reloaded module and of its classes."""
+    for owner in list(_signature_caches.keys()):
+        if owner is module or getattr(owner, "__module__", None) == module.__name__:
+            _signature_caches.pop(owner, None)
 
 
 def deep_homo_type(obj) -> str:
@@ -125,9 +208,259 @@ from collections.abc import Iterable
 #     return tname(obj)
 
 
+# ======== Sampling of iterables ===============
+
+import itertools
+import random
+from collections.abc import Iterator, MappingView, Sequence, Set, Sized
+
+def _is_collection(obj, top=False):
+    """
+    Return True if the object is a sequence or set (but not str/bytes).
+    Iterators/generators and mapping views are collections at the top level only (top=True):
+    sampling consumes them, so the nested ones (e.g. generator attributes, file handles) stay leaf type names.
+    """
+    if isinstance(obj, (str, bytes)):
+        return False
+    if isinstance(obj, (Sequence, Set)):
+        return True
+    return top and isinstance(obj, (Iterator, MappingView))
+
+def _is_deep_type_collection(obj, top=False):
+    """
+    Return True if deep_type() expands the object: a list, tuple or set,
+    or at the top level (top=True) an iterator / generator or mapping view (see _is_collection()).
+    """
+    if isinstance(obj, (list, tuple, set)):
+        return True
+    return top and isinstance(obj, (Iterator, MappingView))
+
+def sample_items(items, max_items=10, sampling="head", seed=None):
+    """Return a sample of up to max_items items of an iterable, in their original order.
+       The iterable is never copied as a whole: sequences are indexed, other iterables are consumed lazily.
+
+    Sampling:
+    - "head": the first max_items items (stops consuming after them).
+    - "stride": evenly spaced items (unsized iterables, e.g. generators, fall back to "reservoir").
+    - "reservoir": uniform random sample, reproducible with seed (one pass over unsized iterables, O(max_items) memory).
+    """
+
+    if max_items is None:
+        return list(items)
+
+    if sampling == "head":
+        return list(itertools.islice(items, max_items))
+
+    if sampling == "stride" and isinstance(items, Sized):
+        n = len(items)
+        if n <= max_items:
+            return list(items)
+        indices = [i * n // max_items for i in range(max_items)]
+        if isinstance(items, Sequence):
+            return [items[i] for i in indices]
+        wanted = set(indices)
+        return [x for i, x in zip(range(indices[-1] + 1), items) if i in wanted]
+
+    if sampling in ("stride", "reservoir"):
+        rng = random.Random(seed)
+        if isinstance(items, Sequence):
+            n = len(items)
+            if n <= max_items:
+                return list(items)
+            return [items[i] for i in sorted(rng.sample(range(n), max_items))]
+
+        # Algorithm R
+        reservoir = []
+        for i, x in enumerate(items):
+            if i < max_items:
+                reservoir.append((i, x))
+            else:
+                j = rng.randrange(i + 1)
+                if j < max_items:
+                    reservoir[j] = (i, x)
+        reservoir.sort(key=lambda item: item[0])
+        return [x for _, x in reservoir]
+
+    raise ValueError(f"Unknown sampling: '{sampling}'")
+
+# ======== Per-class field plans ===============
+
+import dataclasses
+
+_field_plans = weakref.WeakKeyDictionary()     # class → (kind, field names)
+
+def _slot_names(cls):
+    """Return the public __slots__ names declared along the class MRO."""
+    names = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if not name.startswith("_") and name not in names:
+                names.append(name)
+    return names
+
+def _field_plan(cls):
+    """Return the (cached) introspection plan of a class: (kind, field names).
+
+    Kinds:
+    - "fields": fixed public fields (dataclass fields, Pydantic model_fields, __slots__).
+    - "dict": public entries of the instance __dict__ (after the __slots__ names, if any).
+    - "members": no instance fields (e.g. builtin types): public getset/member descriptors
+      of the class (e.g. date.year); read per instance by getattr().
+
+    Properties are not evaluated.
+    Plans are dropped with their class, and when import_util.refresh_func() reloads its module.
+    """
+
+    try:
+        return _field_plans[cls]
+    except KeyError:
+        pass
+
+    model_fields = getattr(cls, "model_fields", None)
+    if dataclasses.is_dataclass(cls):
+        plan = ("fields", tuple(f.name for f in dataclasses.fields(cls) if not f.name.startswith("_")))
+    elif isinstance(model_fields, dict):
+        plan = ("fields", tuple(name for name in model_fields if not name.startswith("_")))
+    elif any("__dict__" in vars(base) for base in cls.__mro__):
+        plan = ("dict", tuple(_slot_names(cls)))
+    elif any("__slots__" in vars(base) for base in cls.__mro__):
+        plan = ("fields", tuple(_slot_names(cls)))
+    else:
+        plan = ("members", tuple(
+            name for name, value in inspect.getmembers(cls)
+            if not name.startswith("_") and (inspect.isgetsetdescriptor(value) or inspect.ismemberdescriptor(value))
+        ))
+
+    _field_plans[cls] = plan
+    return plan
+
+@register_reload_hook
+def _drop_field_plans(module):
+    """Drop the field plans of the classes of a reloaded module."""
+    for cls in list(_field_plans.keys()):
+        if getattr(cls, "__module__", None) == module.__name__:
+            _field_plans.pop(cls, None)
+
+def _object_fields(obj, plan=None):
+    """Return the public (name, value) fields of an object, following its class field plan (see _field_plan()).
+       Unset fields (AttributeError) are skipped.
+    """
+
+    kind, names = plan or _field_plan(type(obj))
+
+    if kind == "dict":
+        fields = [(name, value) for name, value in vars(obj).items() if not name.startswith("_")]
+        if not names:
+            return fields
+    else:
+        fields = []
+
+    slot_fields = []
+    for name in names:
+        try:
+            slot_fields.append((name, getattr(obj, name)))
+        except AttributeError:
+            pass
+    return slot_fields + fields
+
+# ======== Interned type signatures ===============
+
+import weakref
+
+class TypeSig:
+    """
+    Interned type signature, as returned by deep_type_sig().
+    Structurally equal signatures are the same object: hashing and comparison are O(1) (identity).
+    str(sig) is the deep_type() string (built once per signature).
+
+    Kinds:
+    - "name": a type name (primitives, fallback types, "(recursive)")
+    - "list": [item types] - args: item signatures (sorted when printed)
+    - "dict": dict[key types, value types] - args: (key signatures, value signatures) (each sorted when printed)
+    - "object": Name{field: type, ...} - args: ((field, signature), ...)
+    """
+
+    __slots__ = ("kind", "name", "args", "_str", "__weakref__")
+
+    def __init__(self, kind, name, args):
+        self.kind = kind
+        self.name = name
+        self.args = args
+        self._str = None
+
+    def _children(self):
+        if self.kind == "list":
+            return self.args
+        if self.kind == "dict":
+            return self.args[0] + self.args[1]
+        if self.kind == "object":
+            return tuple(v for _, v in self.args)
+        return ()
+
+    def _format(self):
+        if self.kind == "list":
+            return f"[{ ' | '.join(sorted(a._str for a in self.args)) }]"
+        if self.kind == "dict":
+            key_types, val_types = self.args
+            return f"dict[{ ' | '.join(sorted(k._str for k in key_types)) }, { ' | '.join(sorted(v._str for v in val_types)) }]"
+        if self.kind == "object":
+            inner = ", ".join(f"{k}: {v._str}" for k, v in self.args)
+            return f"{self.name}{{{inner}}}"
+        return self.name
+
+    def __str__(self):
+        # built children first, on an explicit stack (no recursion limit)
+        stack = [self]
+        while stack:
+            sig = stack[-1]
+            if sig._str is not None:
+                stack.pop()
+                continue
+            missing = [c for c in sig._children() if c._str is None]
+            if missing:
+                stack.extend(missing)
+            else:
+                sig._str = sig._format()
+                stack.pop()
+        return self._str
+
+    def __repr__(self):
+        return f"TypeSig({str(self)!r})"
+
+_type_sigs = weakref.WeakValueDictionary()
+
+def _type_sig(kind, name, args=(), key=None):
+    """Return the interned signature (interned by key, defaults to args)."""
+
+    key = (kind, name, args if key is None else key)
+    sig = _type_sigs.get(key)
+    if sig is None:
+        sig = TypeSig(kind, name, args)
+        _type_sigs[key] = sig
+    return sig
+
+_NONE_SIG = _type_sig("name", "None")
+_BOOL_SIG = _type_sig("name", "bool")
+_INT_SIG = _type_sig("name", "int")
+_FLOAT_SIG = _type_sig("name", "float")
+_STR_SIG = _type_sig("name", "str")
+_RECURSIVE_SIG = _type_sig("name", "(recursive)")
+_TRUNCATED_SIG = _type_sig("name", "...")
+
+_PRIMITIVE_SIGS = {
+    type(None): _NONE_SIG,
+    bool: _BOOL_SIG,
+    int: _INT_SIG,
+    float: _FLOAT_SIG,
+    str: _STR_SIG,
+}
+
 # ======== Object-aware deep_type ===============
 
-def deep_type(obj, *, max_items=10, seen=None):
+def deep_type(obj, *, max_items=10, seen=None, sampling="head", seed=None, max_depth=None, max_nodes=None):
     """Return the type structure of the object. 
        Supports heterogeneous structures.
 
@@ -143,65 +476,203 @@ def deep_type(obj, *, max_items=10, seen=None):
     'list[int | str | list[int]]'
 
     deep_type({"a": 1, "b": "2", "c": 3.0, "d": True})
-    'dict[str, int | str | float | bool]'
+    'dict[str, bool | float | int | str]'
+
+    Containers are lists, tuples and sets, sampled with sampling="head" | "stride" | "reservoir" and seed,
+    see sample_items(). A top-level iterator / generator or mapping view is sampled too (and consumed);
+    nested ones are reported by their type name (e.g. "generator"), so inspecting does not drain them.
+    Other sequences (e.g. range, deque, bytearray, memoryview) are reported by their type name.
+
+    The string is printed from the interned signature, see deep_type_sig().
+
+    The traversal is iterative (no recursion limit). For hostile inputs, it can be bounded by
+    max_depth (nesting levels of containers expanded) and max_nodes (values inspected):
+    the containers beyond max_depth and the values beyond max_nodes are reported as "...".
 
     See: examples/deep_type_json_schema.py
     """
 
-    if seen is None:
-        seen = set()
+    return str(deep_type_sig(obj, max_items=max_items, seen=seen, sampling=sampling, seed=seed, max_depth=max_depth, max_nodes=max_nodes))
+
+def deep_type_sig(obj, *, max_items=10, seen=None, sampling="head", seed=None, max_depth=None, max_nodes=None):
+    """Return the type structure of the object as an interned TypeSig (see deep_type()).
+       Structurally equal types are the same signature, so payload shapes compare in O(1):
+
+    deep_type_sig({"a": [1, 2]}) is deep_type_sig({"b": [3]})
+    True
+    """
 
-    oid = id(obj)
-    if oid in seen:
-        return "(recursive)"
-    seen.add(oid)
+    return _deep_type_sig(obj, max_items, set() if seen is None else seen, sampling, seed, max_depth, max_nodes)
 
-    # primitives
-    if obj is None:
-        return "None"
+def _deep_type_leaf(obj, seen):
+    """Return the signature of a primitive or of a recursive reference, or None for containers / objects."""
+
+    sig = _PRIMITIVE_SIGS.get(type(obj))
+    if sig is not None:
+        return sig
     if isinstance(obj, bool):
-        return "bool"
+        return _BOOL_SIG
     if isinstance(obj, int):
-        return "int"
+        return _INT_SIG
     if isinstance(obj, float):
-        return "float"
+        return _FLOAT_SIG
     if isinstance(obj, str):
-        return "str"
+        return _STR_SIG
 
-    # list / tuple / set
-    if isinstance(obj, (list, tuple, set)):
-        inner = {
-            deep_type(x, max_items=max_items, seen=seen)
-            for x in list(obj)[:max_items]
-        }
-        return f"[{ ' | '.join(sorted(inner)) }]"
+    # recursion guard: containers / objects on the current path only
+    if id(obj) in seen:
+        return _RECURSIVE_SIG
+    return None
 
-    # dict
+def _deep_type_frame(obj, max_items, seen, sampling, seed, top=False):
+    """
+    Return the traversal frame of a container / object: [kind, obj, (slot, child) iterator, results, pending slot],
+    or its signature if it has no children to visit (top: obj is the root, see _is_collection()).
+    """
+
+    # dict: slot 0 → key, 1 → value
     if isinstance(obj, dict):
-        key_types = {
-            deep_type(k, max_items=max_items, seen=seen)
-            for k in obj.keys()
-        }
-        val_types = {
-            deep_type(v, max_items=max_items, seen=seen)
-            for v in obj.values()
-        }
-        return f"dict[{ ' | '.join(key_types) }, { ' | '.join(val_types) }]"
-
-    # user-defined object → GO DEEP
-    if hasattr(obj, "__dict__"):
-        fields = {
-            name: deep_type(val, max_items=max_items, seen=seen)
-            for name, val in vars(obj).items()
-            if not name.startswith("_")
-        }
+        children = itertools.chain(zip(itertools.repeat(0), obj.keys()), zip(itertools.repeat(1), obj.values()))
+        return ["dict", obj, children, ({}, {}), None]
 
-        inner = ", ".join(f"{k}: {v}" for k, v in fields.items())
-        return f"{obj.__class__.__name__}{{{inner}}}"
+    # list / tuple / set / any iterable
+    if type(obj) in (list, tuple) and sampling == "head":
+        items = obj[:max_items]
+    elif _is_deep_type_collection(obj, top):
+        items = sample_items(obj, max_items, sampling, seed)
+    else:
+        items = None
+    if items is not None:
+        return ["list", obj, zip(itertools.repeat(None), items), {}, None]
+
+    # user-defined object → GO DEEP (slot → field name)
+    plan = _field_plan(type(obj))
+    if plan[0] != "members":
+        return ["object", obj, iter(_object_fields(obj, plan)), {}, None]
 
     # fallback
-    return obj.__class__.__name__
+    return _type_sig("name", obj.__class__.__name__)
+
+def _deep_type_finish(frame):
+    """Return the signature of a visited frame."""
+
+    kind, obj, _, results, _ = frame
+    if kind == "dict":
+        key_types, val_types = tuple(results[0]), tuple(results[1])
+        # unions are order-insensitive (printed sorted)
+        return _type_sig("dict", None, (key_types, val_types), (frozenset(key_types), frozenset(val_types)))
+    if kind == "list":
+        item_types = tuple(results)
+        return _type_sig("list", None, item_types, frozenset(item_types))
+    return _type_sig("object", obj.__class__.__name__, tuple(results.items()))
+
+def _deep_type_sig(obj, max_items, seen, sampling, seed, max_depth=None, max_nodes=None):
+    """deep_type_sig() on an explicit stack of frames (see _deep_type_frame())."""
+
+    sig = _deep_type_leaf(obj, seen)
+    if sig is not None:
+        return sig
+    if max_depth is not None and max_depth < 1:
+        return _TRUNCATED_SIG
+    if max_depth is None:
+        max_depth = sys.maxsize
+    if max_nodes is None:
+        max_nodes = sys.maxsize
+
+    primitive_sigs = _PRIMITIVE_SIGS
+    chain, repeat = itertools.chain, itertools.repeat
+    stack = []
+    try:
+        seen.add(id(obj))
+        frame = _deep_type_frame(obj, max_items, seen, sampling, seed, top=True)
+        if isinstance(frame, TypeSig):
+            seen.discard(id(obj))
+            return frame
+        stack.append(frame)
+        nodes = 1
+
+        while stack:
+            frame = stack[-1]
+            kind, results = frame[0], frame[3]
+            pushed = False
+            for slot, x in frame[2]:
+                if nodes >= max_nodes:
+                    # budget exhausted: stop visiting, mark the unions
+                    if kind == "dict":
+                        results[1][_TRUNCATED_SIG] = None
+                    elif kind == "list":
+                        results[_TRUNCATED_SIG] = None
+                    break
+                nodes += 1
+
+                t = type(x)
+                sig = primitive_sigs.get(t)
+                if sig is None:
+                    if t is dict or t is list or t is tuple:
+                        # fast path of _deep_type_leaf() / _deep_type_frame()
+                        if id(x) in seen:
+                            sig = _RECURSIVE_SIG
+                        elif len(stack) >= max_depth:
+                            sig = _TRUNCATED_SIG
+                        else:
+                            seen.add(id(x))
+                            if t is dict:
+                                child = ["dict", x, chain(zip(repeat(0), x.keys()), zip(repeat(1), x.values())), ({}, {}), None]
+                            elif sampling == "head":
+                                child = ["list", x, zip(repeat(None), x[:max_items]), {}, None]
+                            else:
+                                child = _deep_type_frame(x, max_items, seen, sampling, seed)
+                            frame[4] = slot
+                            stack.append(child)
+                            pushed = True
+                            break
+                    else:
+                        sig = _deep_type_leaf(x, seen)
+                        if sig is None:
+                            if len(stack) >= max_depth:
+                                sig = _TRUNCATED_SIG
+                            else:
+                                seen.add(id(x))
+                                child = _deep_type_frame(x, max_items, seen, sampling, seed)
+                                if isinstance(child, TypeSig):
+                                    seen.discard(id(x))
+                                    sig = child
+                                else:
+                                    frame[4] = slot
+                                    stack.append(child)
+                                    pushed = True
+                                    break
+
+                if kind == "list":
+                    results[sig] = None
+                elif kind == "dict":
+                    results[slot][sig] = None
+                else:
+                    results[slot] = sig
+
+            if pushed:
+                continue
 
+            # all children visited
+            stack.pop()
+            seen.discard(id(frame[1]))
+            sig = _deep_type_finish(frame)
+            if stack:
+                parent = stack[-1]
+                kind, results, slot = parent[0], parent[3], parent[4]
+                if kind == "list":
+                    results[sig] = None
+                elif kind == "dict":
+                    results[slot][sig] = None
+                else:
+                    results[slot] = sig
+
+        return sig
+    except BaseException:
+        for frame in stack:
+            seen.discard(id(frame[1]))
+        seen.discard(id(obj))
+        raise
 
 from collections.abc import Mapping, Sequence
 
@@ -442,73 +913,222 @@ def _merge_schemas(schemas):
 
     return {"oneOf": unique}
 
-# ============ flatten nested oneOf =============================
+# ============ hash-consed schema nodes =========================
+
+class _SchemaNode:
+    """
+    Interned (hash-consed) schema: structurally equal schemas are the same node,
+    so dedup, equality and hashing are O(1) (identity).
+    Dict values are nodes, list values are tuples.
+    """
+
+    __slots__ = ("items", "map", "__weakref__")
+
+    def __init__(self, items):
+        self.items = items
+        self.map = dict(items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def as_dict(self):
+        """Return the schema as new plain dicts and lists (iteratively, nodes may be deeply nested)."""
+        root = {}
+        stack = [(self.items, root)]
+        while stack:
+            items, d = stack.pop()
+            for key, value in items:
+                if isinstance(value, _SchemaNode):
+                    d[key] = {}
+                    stack.append((value.items, d[key]))
+                elif isinstance(value, tuple):
+                    values = d[key] = []
+                    for v in value:
+                        if isinstance(v, _SchemaNode):
+                            values.append({})
+                            stack.append((v.items, values[-1]))
+                        else:
+                            values.append(v)
+                else:
+                    d[key] = value
+        return root
+
+    def __reduce__(self):
+        # unpickled nodes are interned again
+        return (_schema_node, (self.as_dict(),))
+
+    def __repr__(self):
+        return f"_SchemaNode({self.as_dict()!r})"
+
+_schema_nodes = weakref.WeakValueDictionary()
+
+def _intern_items(items):
+    """Return the node of a tuple of (key, interned value) pairs."""
+
+    key = items if all(map(_is_plain_value, items)) else _typed_key(items)
+    node = _schema_nodes.get(key)
+    if node is None:
+        node = _SchemaNode(items)
+        _schema_nodes[key] = node
+    return node
+
+def _is_plain_value(item):
+    value = item[1]
+    if isinstance(value, tuple):
+        return all(isinstance(v, (str, _SchemaNode)) for v in value)
+    return isinstance(value, (str, _SchemaNode))
+
+def _typed_key(items):
+    # other values: their types are part of the key (1, 1.0 and True are distinct schema values)
+    return (items, tuple(_value_types(value) for _, value in items))
+
+def _intern_value(value):
+    if isinstance(value, dict):
+        return _schema_node(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_intern_value(v) for v in value)
+    return value
+
+def _schema_node(schema):
+    """Return the node of a plain schema dict (nodes are returned as is)."""
+
+    if isinstance(schema, _SchemaNode):
+        return schema
+    return _intern_items(tuple((key, _intern_value(value)) for key, value in schema.items()))
+
+def _value_types(value):
+    if isinstance(value, tuple):
+        return tuple(_value_types(v) for v in value)
+    return type(value)
+
+def _type_node(t):
+    return _intern_items((("type", t),))
+
+_EMPTY_NODE = _intern_items(())
+_NULL_NODE = _type_node("null")
+_BOOLEAN_NODE = _type_node("boolean")
+_INTEGER_NODE = _type_node("integer")
+_NUMBER_NODE = _type_node("number")
+_STRING_NODE = _type_node("string")
+_UNKNOWN_NODE = _type_node("unknown")
+_REF_ROOT_NODE = _intern_items((("$ref", "#"),))
+
+_PRIMITIVE_NODES = {
+    type(None): _NULL_NODE,
+    bool: _BOOLEAN_NODE,
+    int: _INTEGER_NODE,
+    float: _NUMBER_NODE,
+    str: _STRING_NODE,
+}
+
+# ============ node merge =======================================
+
+_merge_cache = {}
+_MERGE_CACHE_SIZE = 65536
+
+def _normalize_type_nodes(nodes):
+    types = set()
+
+    for n in nodes:
+        t = n.map.get("type")
+        if isinstance(t, str):
+            types.add(t)
+
+    # collapse integer → number
+    if "number" in types and "integer" in types:
+        types.remove("integer")
+
+    if len(types) == 1:
+        return _type_node(types.pop())
 
-def _is_object_schema(s):
-    return s.get("type") == "object"
+    return _intern_items((("oneOf", tuple(_type_node(t) for t in sorted(types))),))
 
-def _merge_object_schemas(schemas):
+def _merge_object_nodes(nodes):
     props = {}
     additional = []
 
-    for s in schemas:
-        for name, schema in s.get("properties", {}).items():
-            props.setdefault(name, []).append(schema)
+    for n in nodes:
+        properties = n.map.get("properties")
+        if properties is not None:
+            for name, schema in properties.items:
+                props.setdefault(name, []).append(schema)
 
-        if "additionalProperties" in s:
-            additional.append(s["additionalProperties"])
+        if "additionalProperties" in n.map:
+            additional.append(n.map["additionalProperties"])
 
-    merged = {
-        "type": "object",
-        "properties": {
-            name: _merge_schemas(schemas)
+    merged = [
+        ("type", "object"),
+        ("properties", _intern_items(tuple(
+            (name, _merge_nodes(schemas))
             for name, schemas in props.items()
-        }
-    }
+        )))
+    ]
 
     if additional:
-        merged["additionalProperties"] = _merge_schemas(additional)
+        merged.append(("additionalProperties", _merge_nodes(additional)))
 
-    return merged    
+    return _intern_items(tuple(merged))
 
-def _merge_schemas(schemas):
-    schemas = [s for s in schemas if s]
+def _merge_nodes(nodes):
+    """Merge schema nodes by the _merge_schemas() rules, memoized per tuple of node identities."""
 
-    schemas = _flatten_oneof(schemas)
+    key = tuple(nodes)
+    try:
+        return _merge_cache[key]
+    except KeyError:
+        pass
+
+    merged = _merge_nodes_uncached(key)
+
+    if len(_merge_cache) >= _MERGE_CACHE_SIZE:
+        _merge_cache.clear()
+    _merge_cache[key] = merged
+    return merged
+
+def _merge_nodes_uncached(nodes):
+    # flatten nested oneOfs
+    schemas = []
+    for n in nodes:
+        if not n:
+            continue
+        if "oneOf" in n.map:
+            schemas.extend(n.map["oneOf"])
+        else:
+            schemas.append(n)
+
+    # 0️⃣ nothing known (e.g. items of empty arrays)
+    if not schemas:
+        return _EMPTY_NODE
 
     # 1️⃣ arrays → lift merge to items
-    if all(_is_array_schema(s) for s in schemas):
-        return {
-            "type": "array",
-            "items": _merge_schemas([s["items"] for s in schemas])
-        }
+    if all(s.map.get("type") == "array" and "items" in s.map for s in schemas):
+        return _intern_items((
+            ("type", "array"),
+            ("items", _merge_nodes([s.map["items"] for s in schemas]))
+        ))
 
     # 2️⃣ objects → merge properties
-    if all(_is_object_schema(s) for s in schemas):
-        return _merge_object_schemas(schemas)
+    if all(s.map.get("type") == "object" for s in schemas):
+        return _merge_object_nodes(schemas)
 
     # 3️⃣ pure type-only → normalize
-    type_only = [s for s in schemas if set(s.keys()) == {"type"}]
-    if len(type_only) == len(schemas):
-        return _normalize_types(type_only)
+    if all(len(s.items) == 1 and s.items[0][0] == "type" for s in schemas):
+        return _normalize_type_nodes(schemas)
 
-    # 4️⃣ fallback → oneOf
-    unique = []
-    seen = set()
-    for s in schemas:
-        key = repr(s)
-        if key not in seen:
-            seen.add(key)
-            unique.append(s)
+    # 4️⃣ fallback → oneOf (nodes are interned: dedup by identity)
+    unique = list(dict.fromkeys(schemas))
 
     if len(unique) == 1:
         return unique[0]
 
-    return {"oneOf": unique}
+    return _intern_items((("oneOf", tuple(unique)),))
+
+def _merge_schemas(schemas):
+    return _merge_nodes([_schema_node(s) for s in schemas if s]).as_dict()
 
 # ===============================================================    
 
-def json_schema(obj, *, max_items=10, seen=None):
+def json_schema(obj, *, max_items=10, seen=None, sampling="head", seed=None, defs=True, max_depth=None, max_nodes=None):
     """Return the JSON schema of the object.
        Recusrion guard.
 
@@ -537,108 +1157,776 @@ def json_schema(obj, *, max_items=10, seen=None):
             }
         }       
 
+        Arrays may be sequences or sets, sampled with sampling="head" | "stride" | "reservoir" and seed,
+        see sample_items(). A top-level iterator / generator or mapping view is sampled too (and consumed);
+        nested ones are not iterated, so inspecting does not drain them.
+
+        With defs=True, the objects nested in the root object are emitted once per class under "$defs"
+        and referenced by {"$ref": "#/$defs/<class name>"} (instances of the root object class by {"$ref": "#"}).
+        A class definition merges the schemas of all the visited instances of the class (as json_objs_schema()),
+        so the schema size scales with the number of classes, not instances.
+        With defs=False, objects are inlined (recursion → {"$ref": "#"}).
+
+        The traversal is iterative (no recursion limit). For hostile inputs, it can be bounded by
+        max_depth (nesting levels of containers / objects expanded) and max_nodes (values inspected):
+        the values beyond max_depth are {} (any), the containers cut by max_nodes have partial schemas.
+
         See: examples/deep_type_json_schema.py
+    """
 
-        TODO:
-        - Add $defs + $ref (true recursion)
+    defs = _SchemaDefs(obj) if defs else None
+    node = _json_schema_node(obj, max_items=max_items, seen=seen, sampling=sampling, seed=seed, defs=defs,
+                             max_depth=max_depth, max_nodes=max_nodes)
+    if defs is not None and defs.root_nodes:
+        node = _merge_class_nodes([node, *defs.root_nodes])
+    schema = node.as_dict()
+    if defs is not None and defs.nodes:
+        schema["$defs"] = {name: node.as_dict() for name, node in defs.nodes.items()}
+    return schema
+
+def _merge_class_nodes(nodes):
+    """Merge the schema nodes of instances of a class (by the _merge_schemas() rules, keeping the class title)."""
+
+    merged = _merge_nodes(nodes)
+    title = nodes[0].map.get("title")
+    if title is None or "title" in merged.map or merged.map.get("type") != "object":
+        return merged
+    return _intern_items(merged.items[:1] + (("title", title),) + merged.items[1:])
+
+class _SchemaDefs:
+    """
+    Class definitions ($defs) of a json_schema() call: class → name, name → schema node
+    (the merged schema of the instances visited so far, None until the first one is visited).
     """
 
-    if seen is None:
-        seen = set()
+    ROOT = "#"
+
+    def __init__(self, root):
+        self.root = root
+        self.names = {}
+        self.nodes = {}
+        self.root_nodes = {}    # schema nodes of the nested instances of the root object class
+
+    def ref(self, cls):
+        """Return the $ref node of a class, or None if the class is not defined yet."""
+
+        if cls is type(self.root):
+            return _REF_ROOT_NODE
+        name = self.names.get(cls)
+        if name is None:
+            return None
+        return _intern_items((("$ref", f"#/$defs/{name}"),))
+
+    def define(self, cls):
+        """
+        Return (definition name, new) of a class: its name, or a new unique name reserved in first-seen order.
+        Instances of the root object class are defined by the root (name ROOT).
+        """
+
+        if cls is type(self.root):
+            return (self.ROOT, False)
+        name = self.names.get(cls)
+        if name is not None:
+            return (name, False)
+
+        name = cls.__name__
+        if name in self.nodes:
+            name = f"{cls.__module__}.{cls.__qualname__}"
+        base, n = name, 1
+        while name in self.nodes:
+            n += 1
+            name = f"{base}_{n}"
+        self.names[cls] = name
+        self.nodes[name] = None
+        return (name, True)
+
+    def add(self, name, node):
+        """Merge the schema node of an instance into its class definition."""
+
+        if name == self.ROOT:
+            self.root_nodes[node] = None
+            return
+        defined = self.nodes[name]
+        if defined is None or defined is node:
+            self.nodes[name] = node
+        else:
+            self.nodes[name] = _merge_class_nodes([defined, node])
 
-    t = type(obj)
+    def drop(self, cls, name, new):
+        """Forget an unfinished instance: a new definition is unreserved if no instance was added."""
 
-    if id(obj) in seen:
-        return {"$ref": "#"}  # recursion guard
-    seen.add(id(obj))
+        if new and self.nodes.get(name, 0) is None:
+            del self.nodes[name]
+            self.names.pop(cls, None)
+
+def _json_schema_leaf(obj):
+    """Return the schema node of a primitive, or None for containers / objects."""
 
-    # --- primitives ---
-    if obj is None:
-        return {"type": "null"}
+    node = _PRIMITIVE_NODES.get(type(obj))
+    if node is not None:
+        return node
     if isinstance(obj, bool):
-        return {"type": "boolean"}
+        return _BOOLEAN_NODE
     if isinstance(obj, int):
-        return {"type": "integer"}
+        return _INTEGER_NODE
     if isinstance(obj, float):
-        return {"type": "number"}
+        return _NUMBER_NODE
     if isinstance(obj, str):
-        return {"type": "string"}
-
-    # --- sequences ---
-    # Homogeneous → single schema
-    # Heterogeneous → oneOf
-    elif isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
-        items = obj[:max_items]
+        return _STRING_NODE
+    return None
 
-        schemas = [
-            json_schema(x, max_items=max_items, seen=seen)
-            for x in items
-        ]
+def _json_schema_frame(obj, max_items, sampling, seed, defs, top=False):
+    """
+    Return the traversal frame of a container / object:
+    [kind, obj, (key, child) iterator, results, (def name, new) of objects, pending key]
+    (top: obj is the root, see _is_collection()).
+    """
 
-        return {
-            "type": "array",
-            "items": _merge_schemas(schemas)
-        }
+    # --- sequences / iterables ---
+    if _is_collection(obj, top):
+        items = sample_items(obj, max_items, sampling, seed)
+        return ["array", obj, zip(itertools.repeat(None), items), [], None, None]
 
     # --- mappings ---
-    elif isinstance(obj, Mapping):
-        value_schemas = []
+    if isinstance(obj, Mapping):
+        children = ((k, v) for k, v in itertools.islice(obj.items(), max_items) if isinstance(k, str))
+        return ["map", obj, children, [], None, None]
 
-        properties = {}
-        for k, v in list(obj.items())[:max_items]:
-            if isinstance(k, str):
-                s = json_schema(v, max_items=max_items, seen=seen)
-                properties[k] = s
-                value_schemas.append(s)
+    # --- objects ---
+    name = None
+    fields = [
+        (field, value)
+        for field, value in sorted(_object_fields(obj), key=lambda field: field[0])
+        if not inspect.isroutine(value)
+    ]
+    if defs is not None and obj is not defs.root:
+        name = defs.define(type(obj))
+    return ["object", obj, iter(fields), [], name, None]
 
-        return {
-            "type": "object",
-            "properties": properties,
-            "additionalProperties": _merge_schemas(value_schemas)
-        }
+def _json_schema_finish(frame):
+    """Return the schema node of a visited frame."""
 
-    # --- objects ---
-    props = {}
-    for name, value in inspect.getmembers(obj):
-        if name.startswith("_"):
-            continue
-        if inspect.isroutine(value):
-            continue
-        try:
-            props[name] = json_schema(value, max_items=max_items, seen=seen)
-        except Exception:
-            props[name] = {"type": "unknown"}
+    kind, obj, _, results, _, _ = frame
 
-    return {
-        "type": "object",
-        "title": t.__name__,
-        "properties": props
-    }
+    # Homogeneous → single schema
+    # Heterogeneous → oneOf
+    if kind == "array":
+        return _intern_items((
+            ("type", "array"),
+            ("items", _merge_nodes([node for _, node in results]))
+        ))
+
+    if kind == "map":
+        return _intern_items((
+            ("type", "object"),
+            ("properties", _intern_items(tuple(results))),
+            ("additionalProperties", _merge_nodes([node for _, node in results]))
+        ))
+
+    return _intern_items((
+        ("type", "object"),
+        ("title", type(obj).__name__),
+        ("properties", _intern_items(tuple(results)))
+    ))
+
+def _json_schema_drop(frame, seen, defs):
+    """Forget an unfinished frame: recursion guard and reserved class definition."""
+
+    seen.discard(id(frame[1]))
+    if frame[4] is not None:
+        defs.drop(type(frame[1]), *frame[4])
+
+def _json_schema_node(obj, *, max_items=10, seen=None, sampling="head", seed=None, defs=None, max_depth=None, max_nodes=None):
+    """
+    json_schema() as a schema node, on an explicit stack of frames (see _json_schema_frame()).
 
+    If the schema of an object field fails (an attribute or iterable raising), the field is {"type": "unknown"}
+    and the frames above the object are unwound. Other errors are raised.
+    """
+
+    node = _json_schema_leaf(obj)
+    if node is not None:
+        return node
+
+    if seen is None:
+        seen = set()
 
-def json_objs_schema(objs, *, max_items=10):
+    # recursion guard: containers / objects on the current path only
+    if id(obj) in seen:
+        return _REF_ROOT_NODE
+    if max_depth is not None and max_depth < 1:
+        return _EMPTY_NODE
+    if max_depth is None:
+        max_depth = sys.maxsize
+    if max_nodes is None:
+        max_nodes = sys.maxsize
+
+    primitive_nodes = _PRIMITIVE_NODES
+    stack = []
+    try:
+        seen.add(id(obj))
+        frame = _json_schema_frame(obj, max_items, sampling, seed, defs, top=True)
+        if isinstance(frame, _SchemaNode):
+            seen.discard(id(obj))
+            return frame
+        stack.append(frame)
+        nodes = 1
+
+        while stack:
+            frame = stack[-1]
+            kind, results = frame[0], frame[3]
+            child = None
+            try:
+                for key, x in frame[2]:
+                    if nodes >= max_nodes:
+                        # budget exhausted: stop visiting (the schemas are partial)
+                        break
+                    nodes += 1
+
+                    node = primitive_nodes.get(type(x))
+                    if node is None:
+                        node = _json_schema_leaf(x)
+                    if node is None:
+                        if id(x) in seen:
+                            node = _REF_ROOT_NODE
+                        elif len(stack) >= max_depth:
+                            node = _EMPTY_NODE
+                        else:
+                            seen.add(id(x))
+                            try:
+                                child = _json_schema_frame(x, max_items, sampling, seed, defs)
+                            except Exception:
+                                seen.discard(id(x))
+                                if kind != "object":
+                                    raise
+                                child = _UNKNOWN_NODE
+                            if isinstance(child, _SchemaNode):
+                                seen.discard(id(x))
+                                node, child = child, None
+                            else:
+                                frame[5] = key
+                                stack.append(child)
+                                break
+                    results.append((key, node))
+
+                if child is not None:
+                    continue
+                node = _json_schema_finish(frame)
+            except Exception:
+                # the frame failed: unwind to the nearest object, whose pending field is unknown
+                _json_schema_drop(stack.pop(), seen, defs)
+                while stack and stack[-1][0] != "object":
+                    _json_schema_drop(stack.pop(), seen, defs)
+                if not stack:
+                    raise
+                parent = stack[-1]
+                parent[3].append((parent[5], _UNKNOWN_NODE))
+                continue
+
+            # all children visited
+            stack.pop()
+            seen.discard(id(frame[1]))
+            if frame[4] is not None:
+                defs.add(frame[4][0], node)
+                node = defs.ref(type(frame[1]))
+            if not stack:
+                return node
+            parent = stack[-1]
+            parent[3].append((parent[5], node))
+    except BaseException:
+        for frame in stack:
+            _json_schema_drop(frame, seen, defs)
+        raise
+
+
+def json_objs_schema(objs, *, max_items=10, sampling="head", seed=None):
     """
     Detect per-field variance for multiple instances of the same class.
+    objs may be any iterable (consumed once); field values are sampled as in json_schema().
+    Memory does not grow with the number of objects, see SchemaAccumulator.
 
     Return:
         JSON-schema
 
     See: examples/deep_type_json_schema.py
     """
-    
-    props = {}
 
-    for obj in objs:
-        for name, val in vars(obj).items():
-            if name.startswith("_"):
-                continue
-            props.setdefault(name, []).append(
-                json_schema(val, max_items=max_items)
-            )
+    return SchemaAccumulator(max_items=max_items, sampling=sampling, seed=seed).update(objs).schema()
 
-    return {
-        name: _merge_schemas(schemas)
-        for name, schemas in props.items()
-    }
+class SchemaAccumulator:
+    """
+    Online json_objs_schema(): fold objects one at a time into per-field schemas.
+
+    Only the distinct (interned) schemas of each field are kept, in first-occurrence order,
+    and merged on demand by the _merge_schemas() rules, which give the same result
+    as merging all the per-object schemas. Memory is O(distinct field schemas), not O(objects).
+
+    Accumulators are mergeable: acc1.merge(acc2) equals accumulating the objects of acc1, then those of acc2,
+    so partial results of shards or workers can be combined (accumulators are picklable).
+
+    Example:
+        acc = SchemaAccumulator()
+        for obj in objs:
+            acc.add(obj)
+        acc.schema() == json_objs_schema(objs)
+    """
+
+    def __init__(self, *, max_items=10, sampling="head", seed=None):
+        self.max_items = max_items
+        self.sampling = sampling
+        self.seed = seed
+        self.count = 0
+        self.fields = {}    # field name → {schema node: None}
+        self._schema = None
+
+    def add(self, obj):
+        """Fold the fields of an object."""
+
+        fields = self.fields
+        for name, val in _object_fields(obj):
+            schema = _json_schema_node(val, max_items=self.max_items, sampling=self.sampling, seed=self.seed)
+            fields.setdefault(name, {})[schema] = None
+        self.count += 1
+        self._schema = None
+
+    def update(self, objs):
+        """Fold the objects of an iterable. Returns self."""
+
+        for obj in objs:
+            self.add(obj)
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator (its objects follow the objects of this one). Returns self."""
+
+        fields = self.fields
+        for name, schemas in other.fields.items():
+            fields.setdefault(name, {}).update(dict.fromkeys(schemas))
+        self.count += other.count
+        self._schema = None
+        return self
+
+    def schema(self):
+        """Return the merged schema of the folded objects: {field name: JSON-schema}, as json_objs_schema()."""
+
+        if self._schema is None:
+            self._schema = {
+                name: _merge_nodes(list(schemas)).as_dict()
+                for name, schemas in self.fields.items()
+            }
+        return self._schema
+
+# ======== Parallel JSON Lines schema ===============
+
+import concurrent.futures
+import json
+import os
+
+def _json_lines_ranges(path, chunk_size):
+    """Split a file into [start, end) byte ranges of about chunk_size bytes, ending on line boundaries."""
+
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = max(f.tell(), start + 1)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def _json_lines_range_schemas(path, start, end, max_items, sampling, seed):
+    """Return the distinct schema nodes of the JSON Lines records in a byte range, in first-occurrence order."""
+
+    unique = {}
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if line.strip():
+                unique[_json_schema_node(json.loads(line), max_items=max_items, sampling=sampling, seed=seed)] = None
+    return list(unique)
+
+def json_lines_schema(path, *, workers=None, chunk_size=16 * 1024 * 1024, max_items=10, sampling="head", seed=None):
+    """
+    Infer the JSON schema of the records of a JSON Lines (NDJSON) file, in a process pool.
+
+    The file is split into byte ranges of about chunk_size bytes on line boundaries.
+    Each range yields its distinct record schemas, which are reduced in file order by the _merge_schemas() rules
+    (see SchemaAccumulator), so the result does not depend on workers or chunk_size.
+
+    Args:
+        path (str): The JSON Lines file path (blank lines are skipped).
+        workers (int, optional): The number of worker processes. Defaults to None (os.cpu_count()); <= 1 runs in-process.
+        chunk_size (int, optional): The approximate byte range size. Defaults to 16 MiB.
+        max_items, sampling, seed: See json_schema().
+
+    Returns:
+        dict: The merged JSON schema of the records ({} for no records).
+
+    Raises:
+        json.JSONDecodeError: If a line is not valid JSON.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    ranges = _json_lines_ranges(path, chunk_size)
+    args = [(path, start, end, max_items, sampling, seed) for start, end in ranges]
+
+    if workers <= 1 or len(ranges) <= 1:
+        partials = [_json_lines_range_schemas(*a) for a in args]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            partials = list(pool.map(_json_lines_range_schemas, *zip(*args)))
+
+    unique = {}
+    for partial in partials:
+        unique.update(dict.fromkeys(partial))
+
+    return _merge_nodes(list(unique)).as_dict()
+
+# ======== Compiled schema validators ===============
+
+def _is_mapping(value):
+    return type(value) is dict or isinstance(value, Mapping)
+
+def _is_array(value):
+    return type(value) is list or (isinstance(value, (Sequence, Set)) and not isinstance(value, (str, bytes)))
+
+_TYPE_TESTS = {
+    "null": lambda v: v is None,
+    "boolean": lambda v: v is True or v is False,
+    "integer": lambda v: isinstance(v, int) and v is not True and v is not False,
+    "number": lambda v: isinstance(v, (int, float)) and v is not True and v is not False,
+    "string": lambda v: isinstance(v, str),
+    "array": _is_array,
+    "object": _is_mapping,
+}
+
+def _child_path(path, key):
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+def _accept(value):
+    return True
+
+def _accept_errors(value, path, errors):
+    return True
+
+class _SchemaCompiler:
+    """
+    Compile a JSON schema into a pair of closures:
+    check(value) → bool (stops at the first mismatch) and
+    collect(value, path, errors) → bool (appends all the (path, message) mismatches to errors).
+    """
+
+    def __init__(self, root, required):
+        self.root = root
+        self.required = required
+        self.refs = {}  # $ref → [check, collect], filled after compiling the target
+
+    def compile(self, schema):
+        if schema is True or not schema:
+            return _accept, _accept_errors
+        if schema is False:
+            return (lambda v: False), self._reject_errors("not allowed")
+
+        if "$ref" in schema:
+            return self.ref(schema["$ref"])
+
+        parts = []
+        t = schema.get("type")
+        if t is not None and t != "unknown":
+            parts.append(self.type_(t))
+        if "properties" in schema or "additionalProperties" in schema:
+            parts.append(self.object_(schema.get("properties", {}), schema.get("additionalProperties", True)))
+        if "items" in schema:
+            parts.append(self.array_(schema["items"]))
+        if "oneOf" in schema:
+            parts.append(self.one_of(schema["oneOf"]))
+
+        if not parts:
+            return _accept, _accept_errors
+        if len(parts) == 1:
+            return parts[0]
+
+        checks = tuple(check for check, _ in parts)
+        collects = tuple(collect for _, collect in parts)
+
+        def check(v):
+            for c in checks:
+                if not c(v):
+                    return False
+            return True
+
+        def collect(v, path, errors):
+            # type first: the keywords of a mismatching type are not reported
+            if not collects[0](v, path, errors):
+                return False
+            ok = True
+            for c in collects[1:]:
+                ok = c(v, path, errors) and ok
+            return ok
+
+        return check, collect
+
+    def ref(self, ref):
+        cell = self.refs.get(ref)
+        if cell is None:
+            if ref == "#":
+                target = self.root
+            elif ref.startswith("#/$defs/"):
+                target = self.root.get("$defs", {}).get(ref[len("#/$defs/"):])
+                if target is None:
+                    raise ValueError(f"Unresolved $ref: '{ref}'")
+            else:
+                raise ValueError(f"Unsupported $ref: '{ref}'")
+            cell = self.refs[ref] = [None, None]
+            cell[0], cell[1] = self.compile(target)
+        # late bound: the target may still be compiling (recursive schemas)
+        return (lambda v: cell[0](v)), (lambda v, path, errors: cell[1](v, path, errors))
+
+    def _reject_errors(self, message):
+        def collect(v, path, errors):
+            errors.append((path, message))
+            return False
+        return collect
+
+    def type_(self, t):
+        names = [t] if isinstance(t, str) else list(t)
+        for name in names:
+            if name not in _TYPE_TESTS:
+                raise ValueError(f"Unknown schema type: '{name}'")
+        tests = tuple(_TYPE_TESTS[name] for name in names)
+        expected = " | ".join(names)
+
+        if len(tests) == 1:
+            check = tests[0]
+        else:
+            def check(v):
+                for test in tests:
+                    if test(v):
+                        return True
+                return False
+
+        def collect(v, path, errors):
+            if check(v):
+                return True
+            errors.append((path, f"expected {expected}, got {type(v).__name__}"))
+            return False
+
+        return check, collect
+
+    def object_(self, properties, additional):
+        props = tuple((name, *self.compile(schema)) for name, schema in properties.items())
+        names = frozenset(properties)
+        required = self.required
+        if additional is True:
+            add_check = add_collect = None
+        elif additional is False:
+            add_check, add_collect = (lambda v: False), self._reject_errors("unexpected property")
+        else:
+            add_check, add_collect = self.compile(additional)
+            if add_check is _accept:
+                add_check = add_collect = None
+
+        # keywords of objects apply to mappings only (the type is checked by "type")
+        def check(v):
+            if not _is_mapping(v):
+                return True
+            for name, c, _ in props:
+                if name in v:
+                    if not c(v[name]):
+                        return False
+                elif required:
+                    return False
+            if add_check is not None:
+                for name, x in v.items():
+                    if name not in names and not add_check(x):
+                        return False
+            return True
+
+        def collect(v, path, errors):
+            if not _is_mapping(v):
+                return True
+            ok = True
+            for name, _, c in props:
+                if name in v:
+                    ok = c(v[name], _child_path(path, name), errors) and ok
+                elif required:
+                    errors.append((_child_path(path, name), "missing property"))
+                    ok = False
+            if add_collect is not None:
+                for name, x in v.items():
+                    if name not in names:
+                        ok = add_collect(x, _child_path(path, name), errors) and ok
+            return ok
+
+        return check, collect
+
+    def array_(self, items):
+        # keywords of arrays apply to arrays only (the type is checked by "type")
+        if isinstance(items, list):
+            # positional items
+            compiled = [self.compile(schema) for schema in items]
+            checks = tuple(check for check, _ in compiled)
+            collects = tuple(collect for _, collect in compiled)
+
+            def check(v):
+                return not _is_array(v) or all(c(x) for c, x in zip(checks, v))
+
+            def collect(v, path, errors):
+                if not _is_array(v):
+                    return True
+                ok = True
+                for i, (c, x) in enumerate(zip(collects, v)):
+                    ok = c(x, _child_path(path, i), errors) and ok
+                return ok
+
+            return check, collect
+
+        item_check, item_collect = self.compile(items)
+        if item_check is _accept:
+            return _accept, _accept_errors
+
+        def check(v):
+            return not _is_array(v) or all(map(item_check, v))
+
+        def collect(v, path, errors):
+            if not _is_array(v):
+                return True
+            ok = True
+            for i, x in enumerate(v):
+                ok = item_collect(x, _child_path(path, i), errors) and ok
+            return ok
+
+        return check, collect
+
+    def one_of(self, schemas):
+        # inferred alternatives may overlap (e.g. objects with optional properties): any match is valid
+        compiled = [self.compile(schema) for schema in schemas]
+        checks = tuple(check for check, _ in compiled)
+
+        def check(v):
+            for c in checks:
+                if c(v):
+                    return True
+            return False
+
+        if all(isinstance(schema, dict) and list(schema) == ["type"] for schema in schemas):
+            message = "expected " + " | ".join(str(schema["type"]) for schema in schemas) + ", got {}"
+        else:
+            message = f"matches none of {len(checks)} oneOf schemas, got {{}}"
+
+        def collect(v, path, errors):
+            if check(v):
+                return True
+            errors.append((path, message.format(type(v).__name__)))
+            return False
+
+        return check, collect
+
+class SchemaValidator:
+    """
+    Validator compiled from a JSON schema by compile_schema().
+
+    The schema is compiled once into nested closures: validating a record does not read the schema.
+    A valid record is checked by the fast closures only; the error paths are collected for invalid records.
+
+    Example:
+        validator = compile_schema(json_lines_schema("sample.jsonl"))
+        validator({"id": 1})                    → True / False
+        validator.errors({"id": "1"})           → [("id", "expected integer, got str")]
+        validator.validate_many(records)        → {record index: [(path, message), ...]} of the invalid records
+    """
+
+    def __init__(self, schema, required=False):
+        self.schema = schema
+        self.required = required
+        try:
+            self._check, self._collect = _SchemaCompiler(schema, required).compile(schema)
+        except RecursionError:
+            raise ValueError(f"Schema nested too deep to compile (recursion limit: {sys.getrecursionlimit()})") from None
+
+    def __call__(self, record):
+        """Return True if the record matches the schema."""
+
+        try:
+            return self._check(record)
+        except RecursionError:
+            raise _record_too_deep() from None
+
+    def errors(self, record):
+        """
+        Return the mismatches of a record: [(path, message), ...], empty if valid.
+        Paths are like "meta.items[0].id" ("" for the record itself).
+        """
+
+        try:
+            if self._check(record):
+                return []
+            errors = []
+            self._collect(record, "", errors)
+            return errors
+        except RecursionError:
+            raise _record_too_deep() from None
+
+    def validate_many(self, records):
+        """Validate an iterable of records (consumed once). Return {record index: errors()} of the invalid records."""
+
+        check = self._check
+        invalid = {}
+        for i, record in enumerate(records):
+            try:
+                valid = check(record)
+            except RecursionError:
+                raise _record_too_deep() from None
+            if not valid:
+                invalid[i] = self.errors(record)
+        return invalid
+
+    def __reduce__(self):
+        # closures are not picklable: compiled again on unpickle (e.g. in worker processes)
+        return (self.__class__, (self.schema, self.required))
+
+def _record_too_deep():
+    return ValueError(f"Record nested too deep to validate (recursion limit: {sys.getrecursionlimit()})")
+
+def compile_schema(schema, *, required=False):
+    """
+    Compile a JSON schema, as inferred by json_schema() / json_lines_schema(), into a SchemaValidator.
+
+    Supported keywords: "type" (a name or a list of names, "unknown" matches anything), "properties",
+    "additionalProperties", "items" (a schema, or a list of positional schemas), "oneOf" and "$ref"
+    ("#" and "#/$defs/<name>", recursive definitions included). Other keywords ("title", ...) are ignored.
+
+    Inferred unions may overlap, so "oneOf" is checked as a union (at least one alternative matches).
+    Properties are optional as in JSON Schema; with required=True, every listed property must be present.
+    The per-field schemas of json_objs_schema() are compiled as {"type": "object", "properties": fields}.
+
+    Compilation and validation are recursive (a validator is nested closures): schemas, and records of
+    recursive schemas, nested deeper than about sys.getrecursionlimit() / 3 levels raise ValueError.
+    Bound the inference of deep inputs with json_schema(max_depth=...).
+
+    Args:
+        schema (dict): The JSON schema.
+        required (bool, optional): Require all the properties of objects. Defaults to False.
+
+    Returns:
+        SchemaValidator: The compiled validator.
+
+    Raises:
+        ValueError: If the schema has an unknown type or an unresolved $ref, or is nested too deep.
+
+    See: examples/json_schema_validator.py
+    """
 
-            
\ No newline at end of file
+    return SchemaValidator(schema, required=required)
@@ -44,6 +44,49 @@ print(f"json_objs_schema([md1, md2]) = {to_json_pretty(json_objs_schema([md1, md
 print(f"deep_type(md3) = {deep_type(md3)}")
 print(f"json_objs_schema([md1, md2, md3]) = {to_json_pretty(json_objs_schema([md1, md2, md3]))}")
 
+# --- sequences other than list / tuple / set are reported by their type name
+
+import collections
+
+opaque = {"buf": bytearray(b"ab"), "ids": range(3), "view": memoryview(b"ab"), "queue": collections.deque([1])}
+print(f"deep_type(opaque) = {deep_type(opaque)}")
+assert deep_type(opaque) == "dict[str, bytearray | deque | memoryview | range]"
+
+# --- shards: accumulators of worker processes are pickled, their schemas merge as the unsplit objects
+
+import pickle
+
+shard_objs = [HeterogeneousModel(i, "abc", tags) for i, tags in enumerate((1, [1, "a"], "x", [1, "a"], {"a": [1, "a"]}))]
+shard = pickle.loads(pickle.dumps(SchemaAccumulator().update(shard_objs[2:])))
+merged = SchemaAccumulator().update(shard_objs[:2]).merge(shard).schema()
+assert merged == json_objs_schema(shard_objs)
+print(f"merged shards: tags.oneOf = {[s['type'] for s in merged['tags']['oneOf']]}")
+
+# --- recursive / shared classes → $defs + $ref
+
+class Address:
+    def __init__(self, city):
+        self.city = city
+
+class Person:
+    def __init__(self, name, address, friends=()):
+        self.name = name
+        self.address = address
+        self.friends = list(friends)
+
+bob = Person("bob", Address("Prague"))
+alice = Person("alice", Address("Brno"), [bob])
+
+print(f"json_schema(alice) = {to_json_pretty(json_schema(alice))}")
+print(f"json_schema([alice, bob]) = {to_json_pretty(json_schema([alice, bob]))}")
+
+# a class definition merges all its instances: no instance is rejected by the compiled schema
+models = [HeterogeneousModel(1, "abc", ["a"]), HeterogeneousModel(None, "def", None)]
+models_schema = json_schema(models)
+print(f"json_schema(models) = {to_json_pretty(models_schema)}")
+assert models_schema["$defs"]["HeterogeneousModel"]["properties"]["id"] == {"oneOf": [{"type": "integer"}, {"type": "null"}]}
+assert compile_schema(models_schema)([{"id": None, "name": "def", "tags": None}])
+
 
 # ---- Output:
 
@@ -65,7 +108,7 @@ json_schema(heterogeneous_list) = {
     ]
   }
 }
-deep_type(heterogeneous_dict) = dict[str, float | bool | str | int]
+deep_type(heterogeneous_dict) = dict[str, bool | float | int | str]
 json_schema(heterogeneous_dict) = {
   "type": "object",
   "properties": {
@@ -270,5 +313,110 @@ json_objs_schema([md1, md2, md3]) = {
     }
   }
 }
+deep_type(opaque) = dict[str, bytearray | deque | memoryview | range]
+merged shards: tags.oneOf = ['integer', 'array', 'string', 'object']
+json_schema(alice) = {
+  "type": "object",
+  "title": "Person",
+  "properties": {
+    "address": {
+      "$ref": "#/$defs/Address"
+    },
+    "friends": {
+      "type": "array",
+      "items": {
+        "$ref": "#"
+      }
+    },
+    "name": {
+      "type": "string"
+    }
+  },
+  "$defs": {
+    "Address": {
+      "type": "object",
+      "title": "Address",
+      "properties": {
+        "city": {
+          "type": "string"
+        }
+      }
+    }
+  }
+}
+json_schema([alice, bob]) = {
+  "type": "array",
+  "items": {
+    "$ref": "#/$defs/Person"
+  },
+  "$defs": {
+    "Person": {
+      "type": "object",
+      "title": "Person",
+      "properties": {
+        "address": {
+          "$ref": "#/$defs/Address"
+        },
+        "friends": {
+          "type": "array",
+          "items": {
+            "$ref": "#/$defs/Person"
+          }
+        },
+        "name": {
+          "type": "string"
+        }
+      }
+    },
+    "Address": {
+      "type": "object",
+      "title": "Address",
+      "properties": {
+        "city": {
+          "type": "string"
+        }
+      }
+    }
+  }
+}
+json_schema(models) = {
+  "type": "array",
+  "items": {
+    "$ref": "#/$defs/HeterogeneousModel"
+  },
+  "$defs": {
+    "HeterogeneousModel": {
+      "type": "object",
+      "title": "HeterogeneousModel",
+      "properties": {
+        "id": {
+          "oneOf": [
+            {
+              "type": "integer"
+            },
+            {
+              "type": "null"
+            }
+          ]
+        },
+        "name": {
+          "type": "string"
+        },
+        "tags": {
+          "oneOf": [
+            {
+              "type": "array",
+              "items": {
+                "type": "string"
+              }
+            },
+            {
+              "type": "null"
+            }
+          ]
+        }
+      }
+    }
+  }
+}
 """
-
@@ -0,0 +1,94 @@
+import timeit
+
+from pyutils.inspect_util import *
+from pyutils.json_util import *
+
+records = [
+    {"id": i, "name": f"user{i}", "tags": ["a", "b"], "score": 0.5 if i % 2 else None}
+    for i in range(100_000)
+]
+
+schema = json_schema(records[:100])["items"]
+print(f"schema = {to_json_pretty(schema)}")
+
+validator = compile_schema(schema)
+print(f"validator(records[0]) = {validator(records[0])}")
+
+records[7]["tags"].append(3)
+records[42]["score"] = "high"
+records[99] = {"id": "99", "name": "user99", "tags": "a"}
+
+print(f"validator.validate_many(records) = {validator.validate_many(records)}")
+
+strict = compile_schema(schema, required=True)
+print(f"strict.errors(records[99]) = {strict.errors(records[99])}")
+
+class Node:
+    def __init__(self, value, children):
+        self.value = value
+        self.children = children
+
+tree_validator = compile_schema(json_schema(Node(1, [Node(2, [])])))
+print(f"tree_validator.errors(...) = {tree_validator.errors({'value': 1, 'children': [{'value': 'x', 'children': []}]})}")
+
+t = min(timeit.repeat(lambda: validator.validate_many(records), number=1, repeat=3))
+print(f"validate_many: {len(records)} records, {t * 1e6 / len(records):.1f} us/record")
+
+# ---- Output:
+
+"""
+schema = {
+  "type": "object",
+  "properties": {
+    "id": {
+      "type": "integer"
+    },
+    "name": {
+      "type": "string"
+    },
+    "tags": {
+      "type": "array",
+      "items": {
+        "type": "string"
+      }
+    },
+    "score": {
+      "oneOf": [
+        {
+          "type": "null"
+        },
+        {
+          "type": "number"
+        }
+      ]
+    }
+  },
+  "additionalProperties": {
+    "oneOf": [
+      {
+        "type": "integer"
+      },
+      {
+        "type": "string"
+      },
+      {
+        "type": "array",
+        "items": {
+          "type": "string"
+        }
+      },
+      {
+        "type": "null"
+      },
+      {
+        "type": "number"
+      }
+    ]
+  }
+}
+validator(records[0]) = True
+validator.validate_many(records) = {7: [('tags[2]', 'expected string, got int')], 42: [('score', 'expected null | number, got str')], 99: [('id', 'expected integer, got str'), ('tags', 'expected array, got str')]}
+strict.errors(records[99]) = [('id', 'expected integer, got str'), ('tags', 'expected array, got str'), ('score', 'missing property')]
+tree_validator.errors(...) = [('children[0].value', 'expected integer, got str')]
+validate_many: 100000 records, 1.5 us/record
+"""
@@ -0,0 +1,493 @@
+"""
+Lazy JSON loading utilities.
+
+Template-driven, lazy loading of huge JSON files. The file is memory-mapped and the members
+of the top-level object (or the items of the top-level array) are indexed as byte spans in one scan,
+without decoding them. Members are decoded on access only, so reading a few fields of a multi-GB
+export needs memory proportional to the decoded fields, not to the file.
+
+Lazy loading is a memory optimization, not a speed one: the structure is scanned in Python, so indexing
+a whole file and decoding its records through a template is several times slower than `json.load`
+(see examples/json_lazy_util_benchmark.py). It pays off when the file does not fit in memory,
+or when a few values are queried.
+
+The structure of the indexed containers is validated as it is scanned (token order, trailing data),
+nested containers when they are accessed, and the scalars when they are decoded.
+
+Key Functions:
+    - load_json_lazy: Memory-map a JSON file and return a lazy view of its top-level value
+    - loads_json_lazy: Return a lazy view of JSON bytes
+    - LazyJSONObject: Dict-like lazy view of a JSON object
+    - LazyJSONArray: List-like lazy view of a JSON array
+
+Templates:
+    A `dict_as_json` template (dict or `CompiledTemplate`: property names or compiled regex patterns as keys)
+    selects the visible members of the "records": the top-level object, or each object item of a top-level array.
+    Nested objects and arrays are not filtered.
+
+Dependencies:
+    - json: JSON decoding of the selected members
+    - mmap: Memory-mapped file access
+    - re: Scanning of the JSON structure
+    - pyutils.json_util: Template matching
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional, Union
+import abc
+import json
+import mmap
+import os
+import re
+
+from pyutils.json_util import CompiledTemplate
+
+# strings (skipped as a whole) and structural characters; scalars are not tokens
+_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},:]')
+# everything up to the next bracket, strings included
+_SKIP_RE = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_WS_RE = re.compile(rb'[ \t\n\r]*')
+# scalars accepted by json.loads()
+_SCALAR_RE = re.compile(rb'(?:-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|-?Infinity)[ \t\n\r]*')
+_PATH_RE = re.compile(r'\[(-?\d+)\]|([^.\[\]]+)')
+
+_QUOTE, _COMMA, _COLON = ord('"'), ord(','), ord(':')
+_OPEN = (ord('{'), ord('['))
+_CLOSE = (ord('}'), ord(']'))
+
+def _value_start(buf, start: int, end: int) -> int:
+    """Return the position of the first non-whitespace byte of a span."""
+
+    return _WS_RE.match(buf, start, end).end()
+
+_LINES_CHUNK = 1 << 24
+
+def _decode_error(msg: str, buf, pos: int) -> json.JSONDecodeError:
+    """
+    Return a json.JSONDecodeError at a byte position of the buffer.
+    Lines are counted in chunks, so the buffer (e.g. a multi-GB memory map) is not copied.
+    """
+
+    lineno = 1 + sum(bytes(buf[i:min(i + _LINES_CHUNK, pos)]).count(b"\n") for i in range(0, pos, _LINES_CHUNK))
+    colno = pos - buf.rfind(b"\n", 0, pos)
+    err = json.JSONDecodeError(msg, "", 0)
+    err.args = (f"{msg}: line {lineno} column {colno} (byte {pos})",)
+    err.pos, err.lineno, err.colno = pos, lineno, colno
+    return err
+
+def _skip_container(buf, start: int, end: int) -> int:
+    """
+    Return the position after the object or array starting at `start`.
+    Strings and scalars between brackets are skipped by a single regex match
+    (the structure of nested containers is validated when they are decoded or indexed).
+
+    Raises:
+        json.JSONDecodeError: If the container is not terminated within the span.
+    """
+
+    depth = 0
+    pos = start
+    while pos < end:
+        c = buf[pos]
+        if c in _OPEN:
+            depth += 1
+        elif c in _CLOSE:
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        else:
+            break
+        pos = _SKIP_RE.match(buf, pos + 1, end).end()
+    raise _decode_error("Unterminated JSON container", buf, start)
+
+def _check_end(buf, pos: int, end: int) -> None:
+    """Check that only whitespace follows the container closed at `pos` within the span."""
+
+    extra = _value_start(buf, pos, end)
+    if extra < end:
+        raise _decode_error("Extra data", buf, extra)
+
+def _check_scalar(buf, start: int, end: int) -> None:
+    """Check that a span between tokens (starting at a non-whitespace byte) is a single scalar."""
+
+    m = _SCALAR_RE.match(buf, start, end)
+    if m is None:
+        raise _decode_error("Expecting value", buf, start)
+    if m.end() < end:
+        raise _decode_error("Expecting ',' delimiter", buf, m.end())
+
+# scan states: the next expected token
+_KEY, _KEY_COLON, _VALUE, _NEXT = range(4)
+
+_EXPECTING = {
+    _KEY: "Expecting property name enclosed in double quotes",
+    _KEY_COLON: "Expecting ':' delimiter",
+    _VALUE: "Expecting value",
+    _NEXT: "Expecting ',' delimiter",
+}
+
+def _scan_object(buf, start: int, end: int) -> Dict[str, tuple]:
+    """
+    Index the members of the JSON object starting at `start` ('{').
+    The token order (name, colon, value, comma or close) is validated; the values are not decoded.
+
+    Returns:
+        dict: {member name: (value start, value end)} byte spans.
+
+    Raises:
+        json.JSONDecodeError: If the object is malformed or not terminated within the span.
+    """
+
+    members = {}
+    key = None
+    value_start = None
+    state = _KEY
+    empty = True
+    pos = start + 1
+    while True:
+        m = _TOKEN_RE.search(buf, pos, end)
+        if m is None:
+            raise _decode_error("Unterminated JSON object", buf, start)
+        token = m.start()
+        c = buf[token]
+        gap = _value_start(buf, pos, token)
+        pos = m.end()
+        if state == _VALUE:
+            if gap < token:
+                # a scalar value: the token ends it
+                _check_scalar(buf, gap, token)
+                state = _NEXT
+            elif c == _QUOTE or c in _OPEN:
+                if c != _QUOTE:
+                    pos = _skip_container(buf, token, end)
+                state = _NEXT
+                continue
+            else:
+                raise _decode_error(_EXPECTING[_VALUE], buf, token)
+        elif gap < token:
+            raise _decode_error(_EXPECTING[state], buf, gap)
+
+        if state == _KEY:
+            if c == _QUOTE:
+                key = json.loads(m.group())
+                state = _KEY_COLON
+            elif c == _CLOSE[0] and empty:
+                _check_end(buf, pos, end)
+                return members
+            else:
+                raise _decode_error(_EXPECTING[_KEY], buf, token)
+        elif state == _KEY_COLON:
+            if c != _COLON:
+                raise _decode_error(_EXPECTING[_KEY_COLON], buf, token)
+            value_start = pos
+            state = _VALUE
+        else:
+            if c == _COMMA:
+                members[key] = (value_start, token)
+                state = _KEY
+                empty = False
+            elif c == _CLOSE[0]:
+                members[key] = (value_start, token)
+                _check_end(buf, pos, end)
+                return members
+            else:
+                raise _decode_error(_EXPECTING[_NEXT], buf, token)
+
+def _scan_array(buf, start: int, end: int) -> tuple:
+    """
+    Index the items of the JSON array starting at `start` ('[').
+    The token order (value, comma or close) is validated; the items are not decoded.
+
+    Returns:
+        tuple: (item starts, item ends) arrays of byte positions.
+
+    Raises:
+        json.JSONDecodeError: If the array is malformed or not terminated within the span.
+    """
+
+    starts = array('q')
+    ends = array('q')
+    state = _VALUE
+    empty = True
+    item_start = start + 1
+    pos = item_start
+    while True:
+        m = _TOKEN_RE.search(buf, pos, end)
+        if m is None:
+            raise _decode_error("Unterminated JSON array", buf, start)
+        token = m.start()
+        c = buf[token]
+        gap = _value_start(buf, pos, token)
+        pos = m.end()
+        if state == _VALUE:
+            if gap < token:
+                # a scalar item: the token ends it
+                _check_scalar(buf, gap, token)
+                state = _NEXT
+            elif c == _QUOTE or c in _OPEN:
+                if c != _QUOTE:
+                    pos = _skip_container(buf, token, end)
+                state = _NEXT
+                continue
+            elif c == _CLOSE[1] and empty:
+                _check_end(buf, pos, end)
+                return (starts, ends)
+            else:
+                raise _decode_error(_EXPECTING[_VALUE], buf, token)
+        elif gap < token:
+            raise _decode_error(_EXPECTING[_NEXT], buf, gap)
+
+        if c == _COMMA:
+            starts.append(item_start)
+            ends.append(token)
+            item_start = pos
+            state = _VALUE
+            empty = False
+        elif c == _CLOSE[1]:
+            starts.append(item_start)
+            ends.append(token)
+            _check_end(buf, pos, end)
+            return (starts, ends)
+        else:
+            raise _decode_error(_EXPECTING[_NEXT], buf, token)
+
+def _lazy_value(buf, start: int, end: int, object_template: Optional[CompiledTemplate] = None,
+                array_template: Optional[CompiledTemplate] = None):
+    """
+    Return a lazy view of an object or array span (with the template of its kind), or the decoded scalar value.
+    """
+
+    pos = _value_start(buf, start, end)
+    if pos < end:
+        c = buf[pos]
+        if c == _OPEN[0]:
+            return LazyJSONObject(buf, pos, end, object_template)
+        if c == _OPEN[1]:
+            return LazyJSONArray(buf, pos, end, array_template)
+    return json.loads(buf[start:end])
+
+def _parse_path(path: Union[str, Sequence]) -> List:
+    """Parse a path query like "a.b[0].c" into [key, ...] (str keys, int indices)."""
+
+    if not isinstance(path, str):
+        return list(path)
+    return [int(m.group(1)) if m.group(1) is not None else m.group(2) for m in _PATH_RE.finditer(path)]
+
+class _LazyJSONView(abc.ABC):
+    """
+    Base of the lazy views: a byte span of a (memory-mapped) buffer.
+    """
+
+    def __init__(self, buf, start: int, end: int, template = None):
+        self._buf = buf
+        self._start = start
+        self._end = end
+        if template is not None and not isinstance(template, CompiledTemplate):
+            template = CompiledTemplate(template)
+        self._template = template
+
+    def query(self, path: Union[str, Sequence], default: Any = None) -> Any:
+        """
+        Decode the value at a path, decoding only the containers along the path lazily.
+
+        Args:
+            path (str | Sequence): A path like "a.b[0].c", or a sequence of keys and indices.
+            default (Any, optional): The value returned if the path does not exist. Defaults to None.
+
+        Returns:
+            Any: The decoded value (a lazy view is decoded as a whole).
+        """
+
+        value = self
+        for step in _parse_path(path):
+            if not isinstance(value, _LazyJSONView):
+                return default
+            try:
+                value = value.lazy(step)
+            except (KeyError, IndexError, TypeError):
+                return default
+        if isinstance(value, _LazyJSONView):
+            return value.decode()
+        return value
+
+    @abc.abstractmethod
+    def _index(self):
+        """Index the members / items of the view (once) and return the index."""
+
+    @abc.abstractmethod
+    def lazy(self, step):
+        """Return a member / item as a lazy view (objects and arrays) or decoded value (scalars)."""
+
+    @abc.abstractmethod
+    def decode(self) -> Any:
+        """Decode the whole view (members hidden by the template excluded)."""
+
+    def close(self) -> None:
+        """Close the underlying memory map (all views of the file become unusable)."""
+
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class LazyJSONObject(_LazyJSONView, Mapping):
+    """
+    Dict-like lazy view of a JSON object.
+    Members are indexed on first access and decoded (then cached) on item access.
+    If a template is given, only the matching members are visible.
+    """
+
+    def __init__(self, buf, start: int, end: int, template = None):
+        super().__init__(buf, start, end, template)
+        self._members = None
+        self._cache = {}
+
+    def _index(self) -> Dict[str, tuple]:
+        if self._members is None:
+            members = _scan_object(self._buf, self._start, self._end)
+            if self._template is not None:
+                members = {key: span for key, span in members.items() if self._template.match(key)[0]}
+            self._members = members
+        return self._members
+
+    def lazy(self, key: str):
+        """
+        Return a member as a lazy view (objects and arrays) or decoded value (scalars), without caching.
+
+        Raises:
+            KeyError: If the member does not exist or is hidden by the template.
+        """
+
+        start, end = self._index()[key]
+        return _lazy_value(self._buf, start, end)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        start, end = self._index()[key]
+        value = json.loads(self._buf[start:end])
+        self._cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __contains__(self, key) -> bool:
+        return key in self._index()
+
+    def decode(self) -> Dict:
+        return {key: self[key] for key in self._index()}
+
+    def __repr__(self):
+        return f"LazyJSONObject({list(self._index())})"
+
+class LazyJSONArray(_LazyJSONView, Sequence):
+    """
+    List-like lazy view of a JSON array.
+    Items are indexed on first access and decoded on item access (not cached).
+    If a template is given, the object items are decoded through lazy object views with that template
+    (the items of nested arrays are not filtered).
+    """
+
+    def __init__(self, buf, start: int, end: int, template = None):
+        super().__init__(buf, start, end, template)
+        self._items = None
+
+    def _index(self) -> tuple:
+        if self._items is None:
+            self._items = _scan_array(self._buf, self._start, self._end)
+        return self._items
+
+    def lazy(self, index: int):
+        """
+        Return an item as a lazy view (objects and arrays) or decoded value (scalars).
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+
+        starts, ends = self._index()
+        return _lazy_value(self._buf, starts[index], ends[index], self._template)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if self._template is not None:
+            value = self.lazy(index)
+            return value.decode() if isinstance(value, _LazyJSONView) else value
+        starts, ends = self._index()
+        return json.loads(self._buf[starts[index]:ends[index]])
+
+    def __len__(self) -> int:
+        return len(self._index()[0])
+
+    def decode(self) -> List:
+        return [self[i] for i in range(len(self))]
+
+    def __repr__(self):
+        return f"LazyJSONArray(len={len(self)})"
+
+def loads_json_lazy(data: bytes, template = None):
+    """
+    Return a lazy view of a JSON document.
+
+    Args:
+        data (bytes): The JSON document (bytes-like: bytes, mmap, ...).
+        template (dict | CompiledTemplate, optional): Selects the visible members of the top-level object,
+            or of each object item of a top-level array. Defaults to None (all members).
+
+    Returns:
+        LazyJSONObject | LazyJSONArray | Any: A lazy view of the top-level object or array
+            (its top-level members are indexed in one scan), or the decoded scalar value.
+
+    Raises:
+        json.JSONDecodeError: If the structure of the top-level value is malformed (positions are byte offsets).
+    """
+
+    if template is not None and not isinstance(template, CompiledTemplate):
+        template = CompiledTemplate(template)
+    view = _lazy_value(data, 0, len(data), template, template)
+    if isinstance(view, _LazyJSONView):
+        view._index()
+    return view
+
+def load_json_lazy(path: str, template = None):
+    """
+    Memory-map a JSON file and return a lazy view of its top-level value.
+
+    Args:
+        path (str): The JSON file path.
+        template (dict | CompiledTemplate, optional): Selects the visible members of the top-level object,
+            or of each object item of a top-level array. Defaults to None (all members).
+
+    Returns:
+        LazyJSONObject | LazyJSONArray | Any: See `loads_json_lazy`. Use the view as a context manager
+            (or call close()) to release the memory map.
+
+    Raises:
+        json.JSONDecodeError: If the file is empty (as for an empty document), or the structure of its top-level value
+            is malformed (positions are byte offsets).
+
+    Examples:
+        >>> with load_json_lazy("export.json", template = {"id": None, re.compile(r"name_.*"): None}) as records:
+        ...     for i in range(len(records)):
+        ...         print(records[i])
+        >>> load_json_lazy("export.json").query("meta.items[0].id")
+    """
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # empty files cannot be memory-mapped
+            return loads_json_lazy(b"", template)
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads_json_lazy(buf, template)
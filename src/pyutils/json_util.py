@@ -5,38 +5,164 @@ JSON formatting utilities for converting Python objects to JSON strings with cus
 This module provides functions to serialize Python objects, dictionaries, and lists to JSON format
 with support for:
     - Custom indentation and base indentation levels
-    - String truncation for long values
+    - String truncation for long values, at any depth
+    - Output size budget with early stop
     - Template-based filtering of dictionary properties
     - Regex pattern matching for dynamic property selection
-    - Pydantic model serialization
+    - Pydantic model, dataclass, enum, datetime, set and bytes serialization
+    - Streaming output to generators and file-like objects
 
 Key Functions:
     - to_json: Convert an object to a JSON string.
     - to_json_pretty: Convert an object to a JSON string with a default indentation of 2 spaces.
+    - json_dumps: Serialize an object with the selected JSON backend (orjson when installed, stdlib otherwise)
+    - register_json_backend, set_json_backend, get_json_backend: JSON serializer backend registry
     - obj2JSON: Convert objects to JSON-serializable format
+    - register_json_converter, find_json_converter: Type-dispatched obj2JSON converters
+    - BaseIndentJSONEncoder: JSON encoder writing a base indentation in a single pass
     - as_json: Convert objects to formatted JSON strings with indentation control
     - as_json_str_truncated: Convert objects to JSON with optional string truncation
     - dict_as_json: Convert dictionaries to JSON with template-based filtering
-    - list_as_json: Convert lists to formatted JSON arrays
+    - list_as_json: Convert lists to formatted JSON arrays (optionally formatting items in a worker pool)
+    - iter_dict_as_json, iter_list_as_json: Streaming variants yielding JSON chunks
+    - dump_dict_as_json, dump_list_as_json: Streaming variants writing JSON chunks to a file-like object
     - patterns_from_template: Extract regex patterns from template dictionaries
     - find_match_in_template: Search for exact or pattern matches in templates
+    - CompiledTemplate: Precompiled template with merged patterns and cached key matches
+    - json_str_limit, iter_json_budget: Per-depth string limits and output byte budget
+    - write_json_lines: Bulk JSON Lines writer with worker-pool serialization
+    - compile_json_encoder: Generate a JSON encoder specialized for the records of a JSON schema
 
 Dependencies:
     - typing: Type hints
     - json: JSON serialization
+    - orjson (optional): Fast JSON serialization backend
     - re: Regular expression pattern matching
     - pyutils.str_util: String utility functions
     - pyutils.kwargs: Keyword argument extraction
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional
+import collections
+import concurrent.futures
+import dataclasses
+import datetime
+import enum
+import itertools
 import json
+import os
 import re
 import sys
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from pyutils.str_util import truncate_string
 from pyutils.kwargs import getKwarg
 
+# ------------------------------------------------------------
+# obj2JSON converters
+
+def _model_dump_to_json(obj):
+    """Convert a Pydantic model (or any object with a model_dump() method)."""
+
+    try:
+        return obj.model_dump()
+    except Exception:
+        return str(obj)
+
+def _dataclass_to_json(obj):
+    """Convert a dataclass instance to a dict of its fields (nested values are converted by the encoder)."""
+
+    return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+
+def _enum_to_json(obj):
+    return obj.value
+
+def _isoformat_to_json(obj):
+    return obj.isoformat()
+
+def _bytes_to_json(obj):
+    return bytes(obj).decode("utf-8", errors="backslashreplace")
+
+json_converters = {
+    enum.Enum: _enum_to_json,
+    datetime.datetime: _isoformat_to_json,
+    datetime.date: _isoformat_to_json,
+    datetime.time: _isoformat_to_json,
+    set: list,
+    frozenset: list,
+    bytes: _bytes_to_json,
+    bytearray: _bytes_to_json,
+}
+_json_converters_cache = {}
+
+def register_json_converter(cls: type, converter: Callable = None):
+    """
+    Register an obj2JSON converter for a type (and its subclasses).
+    Can be used as a decorator, in the style of `functools.singledispatch`.
+
+    Args:
+        cls (type): The type to convert.
+        converter (callable, optional): The converter, signature: converter(obj) -> Any (JSON-serializable).
+            If omitted, a decorator registering the decorated function is returned.
+
+    Returns:
+        callable: The converter (or the decorator).
+
+    Examples:
+        >>> @register_json_converter(Decimal)
+        ... def decimal_to_json(obj):
+        ...     return float(obj)
+    """
+
+    if converter is None:
+        return lambda converter: register_json_converter(cls, converter)
+
+    global _orjson_enums_native
+
+    json_converters[cls] = converter
+    _json_converters_cache.clear()
+    _orjson_enums_native = None
+    return converter
+
+def find_json_converter(cls: type) -> Callable:
+    """
+    Return the obj2JSON converter for a type.
+    The converter is looked up along the type MRO in the registered converters, then falls back to:
+    dataclass fields, model_dump() (Pydantic models), and finally str().
+    The choice is cached per type.
+
+    Args:
+        cls (type): The type to convert.
+
+    Returns:
+        callable: The converter, signature: converter(obj) -> Any (JSON-serializable).
+    """
+
+    try:
+        return _json_converters_cache[cls]
+    except KeyError:
+        pass
+
+    for base in cls.__mro__:
+        if base in json_converters:
+            converter = json_converters[base]
+            break
+    else:
+        if dataclasses.is_dataclass(cls):
+            converter = _dataclass_to_json
+        elif callable(getattr(cls, "model_dump", None)):
+            converter = _model_dump_to_json
+        else:
+            converter = str
+
+    _json_converters_cache[cls] = converter
+    return converter
+
 def obj2JSON(obj):
     """
     Convert a Python object to a JSON-serializable format.
@@ -45,14 +171,567 @@ def obj2JSON(obj):
         obj: The Python object to be converted.
 
     Returns:
-        Any: A JSON-serializable representation of the object, using model_dump() 
-             if available, otherwise its string representation.
+        Any: A JSON-serializable representation of the object, using the converter registered
+             for its type (see `register_json_converter`; built-in: enums, datetime, set/frozenset, bytes),
+             dataclass fields, model_dump() if available, otherwise its string representation.
     """
 
-    try:
-        return obj.model_dump()
-    except Exception:
-        return str(obj)
+    return find_json_converter(type(obj))(obj)
+
+# ------------------------------------------------------------
+# Output limits
+
+def json_str_limit(str_limits, depth: int) -> Optional[int]:
+    """
+    Return the string length limit for a nesting depth.
+
+    Args:
+        str_limits (int | list, optional): A limit for all depths, or a list of limits per depth
+            (index 0 is the top-level value, the last entry applies to all deeper levels).
+            None (or a None/0 entry) means no limit.
+        depth (int): The nesting depth.
+
+    Returns:
+        int: The string length limit, or None.
+    """
+
+    if str_limits is None or isinstance(str_limits, int):
+        return str_limits
+    if depth < len(str_limits):
+        return str_limits[depth]
+    return str_limits[-1] if str_limits else None
+
+def _shift_str_limits(str_limits, depth: int):
+    """Return the string length limits as seen from a value nested at `depth`."""
+
+    if str_limits is None or isinstance(str_limits, int) or depth == 0:
+        return str_limits
+    return list(str_limits[depth:]) or list(str_limits[-1:])
+
+def iter_json_budget(chunks: Iterator[str], max_bytes: Optional[int]) -> Iterator[str]:
+    """
+    Limit a stream of JSON chunks to a byte budget.
+    Once the budget is spent, the chunk crossing it is cut, a `...[truncated after N bytes]` marker
+    is yielded and the (lazy) chunk iterator is closed, so the serialization stops early.
+
+    N is the budget, not the number of dropped bytes: the size of the rest of the output is unknown
+    until it is serialized, which is the cost the budget avoids.
+
+    Args:
+        chunks (Iterator[str]): The JSON chunks (e.g. `BaseIndentJSONEncoder.iterencode(obj)`).
+        max_bytes (int, optional): Maximum output size in UTF-8 bytes, not counting the marker.
+            None or 0 means no limit.
+
+    Yields:
+        str: The chunks within the budget, then the marker if the output was truncated.
+    """
+
+    if not max_bytes:
+        yield from chunks
+        return
+
+    size = 0
+    for chunk in chunks:
+        ascii_chunk = chunk.isascii()
+        chunk_size = len(chunk) if ascii_chunk else len(chunk.encode())
+        if size + chunk_size > max_bytes:
+            rest = max_bytes - size
+            if ascii_chunk:
+                yield chunk[:rest]
+            else:
+                yield chunk.encode()[:rest].decode(errors="ignore")
+            yield f"...[truncated after {max_bytes} bytes]"
+            if hasattr(chunks, "close"):
+                chunks.close()
+            return
+        size += chunk_size
+        yield chunk
+
+# ------------------------------------------------------------
+
+class BaseIndentJSONEncoder(json.JSONEncoder):
+    """
+    JSON encoder that shifts every output line by a base indentation.
+    The base indentation is written while serializing, in the same single pass,
+    instead of rewriting the serialized string afterwards.
+
+    The output is identical to `json.dumps(obj, indent=indent, ...)` with `base_indent`
+    spaces inserted after every newline.
+
+    Optionally truncates string values per nesting depth (see `str_limits`).
+
+    See: examples/json_util_base_indent_benchmark.py
+    """
+
+    def __init__(self, *, base_indent: int = 0, str_limits = None, **kwargs):
+        """
+        Initialize the encoder.
+
+        Args:
+            base_indent (int, optional): Number of spaces inserted after every newline. Defaults to 0.
+            str_limits (int | list, optional): Maximum length of string values, see `json_str_limit`.
+                Longer strings are truncated with `truncate_string`. Defaults to None (no truncation).
+            **kwargs: `json.JSONEncoder` keyword arguments (indent, default, sort_keys, ...).
+        """
+
+        super().__init__(**kwargs)
+        self.base_indent = base_indent
+        self.str_limits = str_limits
+
+    def iterencode(self, o, _one_shot=False):
+        """
+        Encode the given object and yield each string representation as available.
+        """
+
+        if self.str_limits is None and (not self.base_indent or self.indent is None):
+            # no base indentation to apply, or no newlines at all
+            return super().iterencode(o, _one_shot)
+
+        if self.check_circular:
+            markers = {}
+        else:
+            markers = None
+        if self.ensure_ascii:
+            _encoder = json.encoder.encode_basestring_ascii
+        else:
+            _encoder = json.encoder.encode_basestring
+
+        def floatstr(o, allow_nan=self.allow_nan, _repr=float.__repr__, _inf=float("inf"), _neginf=-float("inf")):
+            if o != o:
+                text = 'NaN'
+            elif o == _inf:
+                text = 'Infinity'
+            elif o == _neginf:
+                text = '-Infinity'
+            else:
+                return _repr(o)
+
+            if not allow_nan:
+                raise ValueError("Out of range float values are not JSON compliant: " + repr(o))
+
+            return text
+
+        indent = self.indent
+        if indent is not None and not isinstance(indent, str):
+            indent = ' ' * indent
+
+        return _make_base_indent_iterencode(
+            markers, self.default, _encoder, indent, ' ' * self.base_indent, floatstr,
+            self.key_separator, self.item_separator, self.sort_keys, self.skipkeys, self.str_limits)(o, 0)
+
+def _make_base_indent_iterencode(markers, _default, _encoder, _indent, _base_indent, _floatstr,
+        _key_separator, _item_separator, _sort_keys, _skipkeys, _str_limits=None,
+        ## HACK: hand-optimized bytecode; turn globals into locals (as in json.encoder)
+        ValueError=ValueError,
+        dict=dict,
+        float=float,
+        id=id,
+        int=int,
+        isinstance=isinstance,
+        list=list,
+        str=str,
+        tuple=tuple,
+        _intstr=int.__repr__,
+    ):
+    """
+    Build the `iterencode` generator of `BaseIndentJSONEncoder`.
+    Mirrors `json.encoder._make_iterencode`, with newlines followed by `_base_indent`
+    and string values truncated to `_str_limits`.
+    """
+
+    newline_indents = {}
+
+    def _newline_indent(_current_indent_level):
+        try:
+            return newline_indents[_current_indent_level]
+        except KeyError:
+            if _indent is None:
+                newline_indent = ''
+            else:
+                newline_indent = '\n' + _base_indent + _indent * _current_indent_level
+            newline_indents[_current_indent_level] = newline_indent
+            return newline_indent
+
+    str_encoders = {}
+
+    def _str_encoder(_current_indent_level):
+        try:
+            return str_encoders[_current_indent_level]
+        except KeyError:
+            pass
+        limit = json_str_limit(_str_limits, _current_indent_level)
+        if limit and limit>0:
+            def str_encoder(o, limit=limit):
+                if len(o)>limit:
+                    o = truncate_string(o, limit)
+                return _encoder(o)
+        else:
+            str_encoder = _encoder
+        str_encoders[_current_indent_level] = str_encoder
+        return str_encoder
+
+    def _iterencode_list(lst, _current_indent_level):
+        if not lst:
+            yield '[]'
+            return
+        if markers is not None:
+            markerid = id(lst)
+            if markerid in markers:
+                raise ValueError("Circular reference detected")
+            markers[markerid] = lst
+        buf = '['
+        _current_indent_level += 1
+        _value_encoder = _str_encoder(_current_indent_level)
+        newline_indent = _newline_indent(_current_indent_level)
+        separator = _item_separator + newline_indent
+        buf += newline_indent
+        first = True
+        for value in lst:
+            if first:
+                first = False
+            else:
+                buf = separator
+            if isinstance(value, str):
+                yield buf + _value_encoder(value)
+            elif value is None:
+                yield buf + 'null'
+            elif value is True:
+                yield buf + 'true'
+            elif value is False:
+                yield buf + 'false'
+            elif isinstance(value, int):
+                yield buf + _intstr(value)
+            elif isinstance(value, float):
+                yield buf + _floatstr(value)
+            else:
+                yield buf
+                if isinstance(value, (list, tuple)):
+                    chunks = _iterencode_list(value, _current_indent_level)
+                elif isinstance(value, dict):
+                    chunks = _iterencode_dict(value, _current_indent_level)
+                else:
+                    chunks = _iterencode(value, _current_indent_level)
+                yield from chunks
+        _current_indent_level -= 1
+        yield _newline_indent(_current_indent_level) + ']'
+        if markers is not None:
+            del markers[markerid]
+
+    def _iterencode_dict(dct, _current_indent_level):
+        if not dct:
+            yield '{}'
+            return
+        if markers is not None:
+            markerid = id(dct)
+            if markerid in markers:
+                raise ValueError("Circular reference detected")
+            markers[markerid] = dct
+        yield '{'
+        _current_indent_level += 1
+        _value_encoder = _str_encoder(_current_indent_level)
+        newline_indent = _newline_indent(_current_indent_level)
+        item_separator = _item_separator + newline_indent
+        yield newline_indent
+        first = True
+        if _sort_keys:
+            items = sorted(dct.items())
+        else:
+            items = dct.items()
+        for key, value in items:
+            if isinstance(key, str):
+                pass
+            elif isinstance(key, float):
+                key = _floatstr(key)
+            elif key is True:
+                key = 'true'
+            elif key is False:
+                key = 'false'
+            elif key is None:
+                key = 'null'
+            elif isinstance(key, int):
+                key = _intstr(key)
+            elif _skipkeys:
+                continue
+            else:
+                raise TypeError(f'keys must be str, int, float, bool or None, '
+                                f'not {key.__class__.__name__}')
+            if first:
+                first = False
+            else:
+                yield item_separator
+            yield _encoder(key)
+            yield _key_separator
+            if isinstance(value, str):
+                yield _value_encoder(value)
+            elif value is None:
+                yield 'null'
+            elif value is True:
+                yield 'true'
+            elif value is False:
+                yield 'false'
+            elif isinstance(value, int):
+                yield _intstr(value)
+            elif isinstance(value, float):
+                yield _floatstr(value)
+            else:
+                if isinstance(value, (list, tuple)):
+                    chunks = _iterencode_list(value, _current_indent_level)
+                elif isinstance(value, dict):
+                    chunks = _iterencode_dict(value, _current_indent_level)
+                else:
+                    chunks = _iterencode(value, _current_indent_level)
+                yield from chunks
+        _current_indent_level -= 1
+        yield _newline_indent(_current_indent_level) + '}'
+        if markers is not None:
+            del markers[markerid]
+
+    def _iterencode(o, _current_indent_level):
+        if isinstance(o, str):
+            yield _str_encoder(_current_indent_level)(o)
+        elif o is None:
+            yield 'null'
+        elif o is True:
+            yield 'true'
+        elif o is False:
+            yield 'false'
+        elif isinstance(o, int):
+            yield _intstr(o)
+        elif isinstance(o, float):
+            yield _floatstr(o)
+        elif isinstance(o, (list, tuple)):
+            yield from _iterencode_list(o, _current_indent_level)
+        elif isinstance(o, dict):
+            yield from _iterencode_dict(o, _current_indent_level)
+        else:
+            if markers is not None:
+                markerid = id(o)
+                if markerid in markers:
+                    raise ValueError("Circular reference detected")
+                markers[markerid] = o
+            o = _default(o)
+            yield from _iterencode(o, _current_indent_level)
+            if markers is not None:
+                del markers[markerid]
+    return _iterencode
+
+# ------------------------------------------------------------
+# Serializer backends
+
+# compact output: the C encoder of the standard library (encoders keep no state between calls)
+_compact_encoder = json.JSONEncoder(default=obj2JSON)
+
+def _stdlib_dumps(obj, indent: Optional[int] = None, base_indent: int = 0, default: Callable = obj2JSON) -> str:
+    """Serialize with the standard library `json` encoder (the reference output)."""
+
+    if indent is None and default is obj2JSON:
+        return _compact_encoder.encode(obj)
+    return BaseIndentJSONEncoder(indent=indent, default=default, base_indent=base_indent).encode(obj)
+
+_ORJSON_FLOAT_HINT_RE = re.compile(rb"e(?<=[0-9]e)|0\.0000")
+_ORJSON_NEWLINE_RE = re.compile(r"\n *")
+_INFINITY = float("inf")
+_NON_ASCII_RE = re.compile("[\x7f-\U0010ffff]")
+
+def _orjson_floats_differ(json_bytes: bytes) -> bool:
+    """
+    Check whether orjson output contains floats formatted differently than by `float.__repr__`
+    (exponent notation, or 1e-05 written as 0.00001). May report false positives on string content.
+    """
+
+    for m in _ORJSON_FLOAT_HINT_RE.finditer(json_bytes):
+        start = m.start()
+        while start > 0 and json_bytes[start-1] in b"0123456789.-":
+            start -= 1
+        end = m.end()
+        while end < len(json_bytes) and json_bytes[end] in b"0123456789.-":
+            end += 1
+        if start > 0 and json_bytes[start-1] != 32:
+            continue
+        if end < len(json_bytes) and json_bytes[end] not in b",\n":
+            continue
+        token = json_bytes[start:end]
+        if b"e" in token or token.lstrip(b"-").startswith(b"0.0000"):
+            return True
+    return False
+
+def _escape_non_ascii(m) -> str:
+    """Escape a non-ASCII character the way `json.encoder.encode_basestring_ascii` does."""
+
+    n = ord(m.group())
+    if n < 0x10000:
+        return f"\\u{n:04x}"
+    n -= 0x10000
+    return f"\\u{0xd800 | ((n >> 10) & 0x3ff):04x}\\u{0xdc00 | (n & 0x3ff):04x}"
+
+def _has_non_finite(obj) -> bool:
+    """Check whether an object has a non-finite float (NaN, Infinity) in its lists, tuples and dict values."""
+
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, float):
+            if o != o or o in (_INFINITY, -_INFINITY):
+                return True
+        elif isinstance(o, dict):
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+    return False
+
+class _DeferToStdlib(ValueError):
+    """Raised to orjson by the `default` wrapper of `_orjson_dumps`: the object is left to the standard library."""
+
+_orjson_enums_native = None
+
+def _enums_native() -> bool:
+    """Check whether the enum converters write the enum value, as orjson does natively (cached until a converter is registered)."""
+
+    global _orjson_enums_native
+
+    if _orjson_enums_native is None:
+        _orjson_enums_native = all(
+            converter is _enum_to_json
+            for cls, converter in list(json_converters.items())
+            if isinstance(cls, type) and issubclass(cls, enum.Enum)
+        )
+    return _orjson_enums_native
+
+def _orjson_dumps(obj, indent: Optional[int] = None, base_indent: int = 0, default: Callable = obj2JSON) -> Optional[str]:
+    """
+    Serialize indented output with `orjson`, emulating the layout of the standard library encoder.
+    orjson only supports 2-space indentation, so other `indent` values and `base_indent` are emulated
+    by re-indenting its 2-space output (JSON strings never contain raw newlines).
+    Non-ASCII characters are escaped as by `ensure_ascii=True`.
+
+    Returns:
+        str: The JSON string, or None if the output could differ from the standard library:
+             compact output (the standard library C encoder is faster), non-integer `indent`,
+             floats formatted differently, and the types orjson serializes differently (see Notes).
+
+    Notes:
+        - orjson writes non-finite floats (NaN, Infinity) as `null`: objects with such floats
+          (checked when the output has a `null`, and in the `default` conversions) are left to the standard library.
+        - Tuple and float subclasses (e.g. namedtuples) are passed by orjson to `default`,
+          the standard library serializes them as arrays and numbers: they are left to the standard library.
+        - orjson serializes enums natively (as their value): with a `default` other than obj2JSON,
+          or with an enum converter other than the built-in one, the standard library is used.
+    """
+
+    if indent is None or not isinstance(indent, int):
+        return None
+    if default is not obj2JSON or not _enums_native():
+        return None
+
+    def _default(o):
+        if isinstance(o, (tuple, float)):
+            raise _DeferToStdlib()
+        o = default(o)
+        if _has_non_finite(o):
+            raise _DeferToStdlib()
+        return o
+
+    json_bytes = orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME)
+    if _orjson_floats_differ(json_bytes):
+        return None
+    if b"null" in json_bytes and _has_non_finite(obj):
+        return None
+
+    json_str = json_bytes.decode()
+    if not json_bytes.isascii() or b"\x7f" in json_bytes:
+        json_str = _NON_ASCII_RE.sub(_escape_non_ascii, json_str)
+    if indent != 2:
+        base = ' '*base_indent
+        json_str = _ORJSON_NEWLINE_RE.sub(lambda m: f"\n{base}{' '*((len(m.group())-1)//2*indent)}", json_str)
+    elif base_indent>0:
+        json_str = json_str.replace("\n", f"\n{' '*base_indent}")
+    return json_str
+
+json_backends = {}
+json_backend = None
+
+def register_json_backend(name: str, dumps: Callable, priority: int = 0, compact: bool = True) -> None:
+    """
+    Register a JSON serializer backend used by `to_json`, `to_json_pretty` and `as_json`.
+
+    Args:
+        name (str): The backend name.
+        dumps (callable): The serializer.
+            Signature: dumps(obj, indent, base_indent, default) -> Optional[str]
+            It must return the same string as the "stdlib" backend, or None to defer to the "stdlib" backend.
+        priority (int, optional): Backends with higher priority are preferred by the automatic selection. Defaults to 0.
+        compact (bool, optional): Whether the backend serializes the compact representation (indent=None);
+            if not, compact output is serialized by the "stdlib" backend without calling it. Defaults to True.
+    """
+
+    json_backends[name] = (priority, dumps, compact)
+
+def set_json_backend(name: Optional[str] = None) -> None:
+    """
+    Select the JSON serializer backend.
+
+    Args:
+        name (str, optional): A registered backend name, or None to select the registered backend
+            with the highest priority (orjson when installed, otherwise stdlib). Defaults to None.
+
+    Raises:
+        ValueError: If the backend is not registered.
+    """
+
+    global json_backend
+
+    if name is None:
+        name = max(json_backends, key=lambda n: json_backends[n][0])
+    if name not in json_backends:
+        raise ValueError(f"Unknown JSON backend: '{name}'")
+    json_backend = name
+
+def get_json_backend() -> str:
+    """
+    Return the name of the selected JSON serializer backend.
+    """
+
+    if json_backend is None:
+        set_json_backend()
+    return json_backend
+
+def json_dumps(obj, indent: Optional[int] = None, base_indent: int = 0, default: Callable = obj2JSON) -> str:
+    """
+    Serialize an object to a JSON string with the selected backend.
+    The output is the same for all backends; if the selected backend cannot serialize the object
+    identically (or fails), the "stdlib" backend is used.
+
+    Args:
+        obj: The object to convert to JSON.
+        indent (int, optional): The number of spaces per indentation level, None for the compact representation. Defaults to None.
+        base_indent (int, optional): The base indentation (number of spaces) applied to all lines but the first. Defaults to 0.
+        default (callable, optional): Converter of objects that are not JSON-serializable. Defaults to obj2JSON.
+
+    Returns:
+        str: The JSON string representation of the object.
+
+    See: examples/json_util_backends_parity.py
+    """
+
+    name = json_backend or get_json_backend()
+    if name != "stdlib":
+        _, dumps, compact = json_backends[name]
+        if indent is None and not compact:
+            return _stdlib_dumps(obj, indent, base_indent, default)
+        try:
+            json_str = dumps(obj, indent, base_indent, default)
+        except Exception:
+            json_str = None
+        if json_str is not None:
+            return json_str
+    return _stdlib_dumps(obj, indent, base_indent, default)
+
+register_json_backend("stdlib", _stdlib_dumps)
+if orjson is not None:
+    # compact output: the standard library C encoder is faster than orjson output rewritten to its separators
+    register_json_backend("orjson", _orjson_dumps, priority=10, compact=False)
+
+# ------------------------------------------------------------
 
 #def as_json(obj, indent=2) -> str:
 def as_json(obj, **kwargs) -> str:
@@ -65,49 +744,57 @@ def as_json(obj, **kwargs) -> str:
             - base_indent (int): The base indentation level (number of spaces) to apply 
               to all lines. Default is 0.
             - indent (int): The number of spaces per indentation level. Default is 2.
+            - deep_str_limit (int | list, optional): Maximum length of string values at any depth,
+              or a list of limits per depth (see `json_str_limit`). Default is None.
+            - max_bytes (int, optional): Maximum output size in bytes; the serialization stops early
+              and the output ends with a "...[truncated after N bytes]" marker
+              (N = max_bytes). Default is None.
 
     Returns:
         str: A JSON-formatted string representation of the input object.
 
     Notes:
-        - Uses json.dumps() with a custom obj2JSON serializer for handling non-standard types.
+        - Serializes with the selected JSON backend (see `json_dumps`) and a custom obj2JSON serializer for handling non-standard types.
         - If base_indent is greater than 0, all indentation in the output is adjusted 
           by adding base_indent spaces to each indented line.
+          The base indentation is written by the encoder in the same pass.
+        - With deep_str_limit or max_bytes, the output is produced by `BaseIndentJSONEncoder`.
     """
 
     base_indent = getKwarg(kwargs, 'base_indent', 0)
     indent = getKwarg(kwargs, 'indent', 2)
+    deep_str_limit = getKwarg(kwargs, 'deep_str_limit', None)
+    max_bytes = getKwarg(kwargs, 'max_bytes', None)
 
-    json_str =  json.dumps(obj, indent=indent, default=obj2JSON)
-    if base_indent>0:
-        json_str = json_str.replace(f"\n{' '*indent}",f"\n{' '*(base_indent+indent)}")
-        new_line_only_re = r"\n([^\s\n])"
-        new_line_only_base_indent_re = rf"\n{' '*(base_indent)}\1"
-        json_str = re.sub(new_line_only_re, new_line_only_base_indent_re, json_str)
-    return json_str
+    if deep_str_limit is None and not max_bytes:
+        return json_dumps(obj, indent=indent, base_indent=base_indent)
+    return "".join(iter_json_budget(_iter_as_json(obj, base_indent, indent, deep_str_limit), max_bytes))
 
 def as_json_str_truncated(obj,  **kwargs) -> str:
-    def as_json_str_truncated(obj, **kwargs) -> str:
-        """
-        Convert an object to a JSON string representation with optional truncation of string values.
+    """
+    Convert an object to a JSON string representation with optional truncation of string values.
 
-        Args:
-            obj: The object to convert to JSON string format.
-            **kwargs: Arbitrary keyword arguments including:
-                base_indent (int): Base indentation level for JSON formatting. Default is 0.
-                indent (int): Number of spaces per indentation level. Default is 2.
-                str_limit (int, optional): Maximum length for string values. If specified and greater than 0,
-                                           strings will be truncated to this length. Default is None.
+    Args:
+        obj: The object to convert to JSON string format.
+        **kwargs: Arbitrary keyword arguments including:
+            base_indent (int): Base indentation level for JSON formatting. Default is 0.
+            indent (int): Number of spaces per indentation level. Default is 2.
+            str_limit (int, optional): Maximum length for string values. If specified and greater than 0,
+                                       strings will be truncated to this length. Default is None.
+            deep_str_limit (int | list, optional): Maximum length of nested string values, see `as_json`. Default is None.
+            max_bytes (int, optional): Maximum output size in bytes, see `as_json`. Default is None.
 
-        Returns:
-            str: JSON string representation of the object. If the object is a string and str_limit is set,
-                 the string will be truncated to the specified limit. Otherwise, the object is converted
-                 to JSON using standard formatting with the specified indentation.
-        """
+    Returns:
+        str: JSON string representation of the object. If the object is a string and str_limit is set,
+             the string will be truncated to the specified limit. Otherwise, the object is converted
+             to JSON using standard formatting with the specified indentation.
+    """
 
     base_indent = getKwarg(kwargs, 'base_indent', 0)
     indent = getKwarg(kwargs, 'indent', 2)
     str_limit = getKwarg(kwargs, 'str_limit', None)
+    deep_str_limit = getKwarg(kwargs, 'deep_str_limit', None)
+    max_bytes = getKwarg(kwargs, 'max_bytes', None)
 
     if isinstance(obj, str):
         if str_limit and str_limit>0:
@@ -115,11 +802,11 @@ def as_json_str_truncated(obj,  **kwargs) -> str:
             #     raise TypeError("'obj' must be a str")
             #json_str = f"[{len(obj)} chars]\"{truncate_string(obj, str_limit)}\""
             json_str = f"\"{truncate_string(obj, str_limit)}\""
-            return json_str
+            return "".join(iter_json_budget(iter((json_str,)), max_bytes))
         # else:
         #     #json_str = f"{as_json(obj, base_indent = base_indent + indent, indent = indent)}"
 
-    json_str = as_json(obj, base_indent = base_indent + indent, indent = indent)
+    json_str = as_json(obj, base_indent = base_indent + indent, indent = indent, deep_str_limit = deep_str_limit, max_bytes = max_bytes)
     return json_str
 
 
@@ -194,36 +881,200 @@ def find_match_in_template(template: Dict, dict_item: str, patterns: Dict = None
 
     return (False, None)
 
-def dict_as_json(obj: Dict, **kwargs) -> str:
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+class CompiledTemplate:
     """
-    Convert a dictionary or Pydantic model to a formatted JSON string with optional filtering and truncation.
+    Compiled `dict_as_json` template.
+    Precomputes the template patterns once, merges the regex keys into a single alternation
+    and caches the match decision per key name, so that rendering the same template
+    many times does not re-scan all patterns for every key.
+
+    Can be passed to `dict_as_json` (and its streaming variants) in place of the raw template dict.
+
+    Attributes:
+        template (Dict): The source template dictionary.
+        patterns (Dict): The regex patterns of the template (see `patterns_from_template`).
+
+    Examples:
+        >>> template = CompiledTemplate({"name": 20, re.compile(r"z_\\d+"): 5})
+        >>> template.match("z_1")
+        (True, 5)
+        >>> dict_as_json({"name": "abc", "z_1": "xyz", "other": 1}, template = template)
+    """
+
+    def __init__(self, template: Dict, cache_size: int = 4096):
+        """
+        Compile a template dictionary.
+
+        Args:
+            template (Dict): A dictionary with property names or compiled regex patterns as keys
+                and string length limits as values (see `dict_as_json`).
+            cache_size (int, optional): Maximum number of key names whose match decision is cached.
+                The cache is cleared when full. Defaults to 4096.
+        """
+
+        self.template = template
+        self.patterns = patterns_from_template(template)
+        self.cache_size = cache_size
+        self._cache = {}
+        self._regex, self._group_values = self._merge_patterns(self.patterns)
+
+    @staticmethod
+    def _merge_patterns(patterns: Dict) -> tuple:
+        """
+        Merge the patterns into one alternation of wrapping groups.
+
+        Returns:
+            tuple: (merged pattern, {wrapping group index: template value}),
+                or (None, None) when the patterns cannot be merged safely
+                (different flags, verbose patterns, backreferences, clashing group names).
+        """
+
+        if len(patterns) < 2:
+            return (None, None)
+        flags = {pattern.flags for pattern in patterns}
+        if len(flags) > 1:
+            return (None, None)
+        flags = flags.pop()
+        if flags & re.VERBOSE:
+            return (None, None)
+        if any(_BACKREF_RE.search(pattern.pattern) for pattern in patterns):
+            return (None, None)
+
+        alternatives = []
+        group_values = {}
+        group_index = 1
+        for pattern, value in patterns.items():
+            alternatives.append(f"({pattern.pattern})")
+            group_values[group_index] = value
+            group_index += pattern.groups + 1
+        try:
+            regex = re.compile("|".join(alternatives), flags)
+        except re.error:
+            return (None, None)
+        return (regex, group_values)
+
+    def _find_match(self, dict_item: str) -> tuple[bool, Any]:
+        if dict_item in self.template:
+            return (True, self.template[dict_item])
+
+        if self._regex is None:
+            return find_match_in_template({}, dict_item, self.patterns)
+
+        m = self._regex.fullmatch(dict_item)
+        if m is None:
+            return (False, None)
+        # the wrapping group of the matching alternative closes last
+        return (True, self._group_values[m.lastindex])
+
+    def match(self, dict_item: str) -> tuple[bool, Any]:
+        """
+        Search for a match of dict_item in the template, see `find_match_in_template`.
+
+        Args:
+            dict_item (str): The key/string to search for in the template.
+
+        Returns:
+            tuple: A tuple of (bool, Any) where:
+                - bool: True if a match is found (exact or pattern), False otherwise.
+                - Any: The value from the template if match is found, None otherwise.
+        """
+
+        try:
+            return self._cache[dict_item]
+        except KeyError:
+            pass
+
+        result = self._find_match(dict_item)
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[dict_item] = result
+        return result
+
+def _iter_pool_map(func: Callable, chunks: Iterable, workers: int, executor: Optional[str], *args) -> Iterator:
+    """
+    Yield func(chunk, *args) for each chunk, in input order, computed in a thread or process pool
+    with a bounded number of chunks in flight. With executor None or workers <= 1
+    the chunks are processed in the calling thread.
+
+    Raises:
+        ValueError: If the executor is unknown.
+    """
+
+    if executor not in (None, "thread", "process"):
+        raise ValueError(f"Unknown executor: '{executor}'")
+
+    if executor is None or workers <= 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+    else:
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+
+    with pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _iter_chunks(records: Iterable, chunk_size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most chunk_size items."""
+
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _iter_as_json(obj, base_indent: int = 0, indent: int = 2, deep_str_limit = None) -> Iterator[str]:
+    """
+    Yield the chunks of `as_json(obj, base_indent = base_indent, indent = indent, deep_str_limit = deep_str_limit)`.
+    """
+
+    return BaseIndentJSONEncoder(indent=indent, default=obj2JSON, base_indent=base_indent, str_limits=deep_str_limit).iterencode(obj)
+
+def _iter_as_json_str_truncated(obj, base_indent: int = 0, indent: int = 2, str_limit: int = None, deep_str_limit = None) -> Iterator[str]:
+    """
+    Yield the chunks of `as_json_str_truncated(obj, base_indent = base_indent, indent = indent, str_limit = str_limit, deep_str_limit = deep_str_limit)`.
+    """
+
+    if isinstance(obj, str) and str_limit and str_limit>0:
+        yield f"\"{truncate_string(obj, str_limit)}\""
+        return
+
+    yield from _iter_as_json(obj, base_indent = base_indent + indent, indent = indent, deep_str_limit = deep_str_limit)
+
+def iter_dict_as_json(obj: Dict, **kwargs) -> Iterator[str]:
+    """
+    Convert a dictionary or Pydantic model to a formatted JSON string, yielding it chunk by chunk.
+    Streaming variant of `dict_as_json`: `"".join(iter_dict_as_json(obj, **kwargs)) == dict_as_json(obj, **kwargs)`.
 
     Args:
         obj (Dict): A dictionary or Pydantic model object to convert to JSON string.
-        **kwargs: Optional keyword arguments:
-            - template (dict, optional): A dictionary specifying which properties to include and their string length limits.
-              Keys are property names, values are character limits for that property's string representation.
-              Defaults to None (all properties included).
-            - base_indent (int, optional): Base indentation level in spaces. Defaults to 0.
-            - indent (int, optional): Indentation step size in spaces. Defaults to 2.
+        **kwargs: Optional keyword arguments, see `dict_as_json`.
 
-    Returns:
-        str: A formatted JSON string representation of the object. Properties not included in the template
-             are hidden and their count is noted in a comment.
+    Yields:
+        str: Consecutive chunks of the JSON string.
 
     Raises:
         TypeError: If obj is neither a dict nor has a model_dump() method, or if the resulting object is not a dict.
-
-    Notes:
-        - Properties matching the template are included with specified string length limits.
-        - Non-matching properties are excluded and counted in a comment at the end.
-        - The output uses indentation for readability when indent > 0.
-        - If no properties match the template, only "{}" is returned.
     """
 
+    return iter_json_budget(_iter_dict_as_json(obj, **kwargs), getKwarg(kwargs, 'max_bytes', None))
+
+def _iter_dict_as_json(obj: Dict, **kwargs) -> Iterator[str]:
     template = getKwarg(kwargs, 'template', None)
     base_indent = getKwarg(kwargs, 'base_indent', 0)
     indent = getKwarg(kwargs, 'indent', 2)
+    deep_str_limit = _shift_str_limits(getKwarg(kwargs, 'deep_str_limit', None), 1)
 
     if isinstance(obj, dict):
         dict_obj = obj
@@ -232,40 +1083,184 @@ def dict_as_json(obj: Dict, **kwargs) -> str:
     if not isinstance(dict_obj, dict):
         raise TypeError("'obj' must be a dict")
 
-    patterns = patterns_from_template(template)
+    compiled = isinstance(template, CompiledTemplate)
+    patterns = patterns_from_template(template) if template is not None and not compiled else None
 
-    json_str = "{"
+    yield "{"
     first = True
-    match_cnt = 0
     hidden_props = []
     for dict_item in dict_obj:
-        #if dict_item in template:
-        match, limit = find_match_in_template(template, dict_item, patterns)
+        if compiled:
+            match, limit = template.match(dict_item)
+        elif template is not None:
+            match, limit = find_match_in_template(template, dict_item, patterns)
+        else:
+            match, limit = (True, None)
         if match:
-            match_cnt += 1
-            limit = template[dict_item]
             if first:
                 first = False
+                prefix = ""
             else:
-                json_str += ","
+                prefix = ","
             if indent:
-                json_str += f"\n{' '*(base_indent+indent)}"
-            json_str += f"\"{dict_item}\": "
+                prefix += f"\n{' '*(base_indent+indent)}"
+            yield f"{prefix}\"{dict_item}\": "
 
             item_value = dict_obj[dict_item]
-            json_str += as_json_str_truncated(item_value, base_indent = base_indent + indent, indent = indent, str_limit = limit)
+            yield from _iter_as_json_str_truncated(item_value, base_indent = base_indent + indent, indent = indent, str_limit = limit, deep_str_limit = deep_str_limit)
         else:
             hidden_props.append(dict_item)
-    hidden = len(dict_obj) - match_cnt
+    hidden = len(hidden_props)
     if hidden>0:
-        json_str += f"\n{' '*(base_indent + indent)}// {hidden} properties hidden {hidden_props}"
+        yield f"\n{' '*(base_indent + indent)}// {hidden} properties hidden {hidden_props}"
         first = False
 
-    if first:                
-        json_str += "}"
+    if first:
+        yield "}"
     else:
-        json_str += f"\n{' '*base_indent}}}"
-    return json_str
+        yield f"\n{' '*base_indent}}}"
+
+def dict_as_json(obj: Dict, **kwargs) -> str:
+    """
+    Convert a dictionary or Pydantic model to a formatted JSON string with optional filtering and truncation.
+
+    Args:
+        obj (Dict): A dictionary or Pydantic model object to convert to JSON string.
+        **kwargs: Optional keyword arguments:
+            - template (dict | CompiledTemplate, optional): A dictionary specifying which properties to include and their string length limits.
+              Keys are property names (or compiled regex patterns), values are character limits for that property's string representation.
+              Pass a `CompiledTemplate` when the same template is rendered many times.
+              Defaults to None (all properties included).
+            - base_indent (int, optional): Base indentation level in spaces. Defaults to 0.
+            - indent (int, optional): Indentation step size in spaces. Defaults to 2.
+            - deep_str_limit (int | list, optional): Maximum length of string values at any depth,
+              or a list of limits per depth (see `json_str_limit`). Template limits take precedence
+              for top-level property strings. Defaults to None.
+            - max_bytes (int, optional): Maximum output size in bytes; the serialization stops early
+              and the output ends with a "...[truncated after N bytes]" marker
+              (N = max_bytes). Defaults to None.
+
+    Returns:
+        str: A formatted JSON string representation of the object. Properties not included in the template
+             are hidden and their count is noted in a comment.
+
+    Raises:
+        TypeError: If obj is neither a dict nor has a model_dump() method, or if the resulting object is not a dict.
+
+    Notes:
+        - Properties matching the template are included with specified string length limits.
+        - Non-matching properties are excluded and counted in a comment at the end.
+        - The output uses indentation for readability when indent > 0.
+        - If no properties match the template, only "{}" is returned.
+        - See `iter_dict_as_json` and `dump_dict_as_json` for the streaming variants.
+    """
+
+    return "".join(iter_dict_as_json(obj, **kwargs))
+
+def dump_dict_as_json(obj: Dict, fp: IO[str], **kwargs) -> None:
+    """
+    Write a dictionary or Pydantic model as a formatted JSON string to a file-like object.
+    Streaming variant of `dict_as_json`: chunks are written as they are produced.
+
+    Args:
+        obj (Dict): A dictionary or Pydantic model object to convert to JSON string.
+        fp (IO[str]): A `.write()`-supporting file-like object (file, `io.StringIO`, socket `makefile('w')`, ...).
+        **kwargs: Optional keyword arguments, see `dict_as_json`.
+    """
+
+    fp.writelines(iter_dict_as_json(obj, **kwargs))
+
+def iter_list_as_json(l: List, **kwargs) -> Iterator[str]:
+    """
+    Convert a list to a formatted JSON string representation, yielding it chunk by chunk.
+    Streaming variant of `list_as_json`: `"".join(iter_list_as_json(l, **kwargs)) == list_as_json(l, **kwargs)`.
+
+    Args:
+        l (List): The list to convert to JSON format. Can be None or a non-list object.
+        **kwargs: Optional keyword arguments, see `list_as_json`.
+            If `to_json` is not given, list items are streamed by the JSON encoder too.
+
+    Yields:
+        str: Consecutive chunks of the JSON string.
+    """
+
+    return iter_json_budget(_iter_list_as_json(l, **kwargs), getKwarg(kwargs, 'max_bytes', None))
+
+def _list_items_as_json(items: List, to_json: Optional[Callable], base_indent: int, indent: int, deep_str_limit) -> str:
+    """
+    Format a chunk of list items as by `list_as_json`, joined with the item separator (parallel mode worker).
+    """
+
+    separator = "," + (f"\n{' '*indent}" if indent else "")
+    if to_json is None:
+        deep_str_limit = _shift_str_limits(deep_str_limit, 1)
+        return separator.join(["".join(_iter_as_json(item, base_indent + indent, indent, deep_str_limit)) for item in items])
+    return separator.join([to_json(item, base_indent = base_indent + indent, indent = indent) for item in items])
+
+def _iter_list_as_json_parallel(l: List, to_json: Optional[Callable], base_indent: int, indent: int, deep_str_limit,
+                                chunk_size: int, workers: int, executor: str) -> Iterator[str]:
+    """
+    Yield the chunks of a non-empty list formatted by `list_as_json`, with the items formatted in a worker pool.
+    """
+
+    separator = "," + (f"\n{' '*indent}" if indent else "")
+    chunks = (l[i:i + chunk_size] for i in range(0, len(l), chunk_size))
+
+    yield "[" + (f"\n{' '*indent}" if indent else "")
+    first = True
+    for items_json in _iter_pool_map(_list_items_as_json, chunks, workers, executor, to_json, base_indent, indent, deep_str_limit):
+        if first:
+            first = False
+        else:
+            yield separator
+        yield items_json
+    yield "\n]"
+
+def _iter_list_as_json(l: List, **kwargs) -> Iterator[str]:
+    to_json = getKwarg(kwargs, 'to_json', None)
+    base_indent = getKwarg(kwargs, 'base_indent', 0)
+    indent = getKwarg(kwargs, 'indent', 2)
+    deep_str_limit = getKwarg(kwargs, 'deep_str_limit', None)
+    parallel = getKwarg(kwargs, 'parallel', False)
+    parallel_threshold = getKwarg(kwargs, 'parallel_threshold', 20000)
+
+    if to_json is None:
+        iter_to_json = lambda obj, base_indent, indent, depth: _iter_as_json(obj, base_indent, indent, _shift_str_limits(deep_str_limit, depth))
+    else:
+        iter_to_json = lambda obj, base_indent, indent, depth: (to_json(obj, base_indent = base_indent, indent = indent),)
+
+    if l is None:
+        yield "None"
+        return
+
+    if not isinstance(l, list):
+        yield from iter_to_json(l, base_indent = base_indent + indent, indent = indent, depth = 0)
+        return
+
+    if parallel and l and len(l) >= parallel_threshold:
+        workers = getKwarg(kwargs, 'workers', os.cpu_count() or 1)
+        chunk_size = getKwarg(kwargs, 'chunk_size', max(1000, len(l) // (4 * workers)))
+        executor = getKwarg(kwargs, 'executor', "process")
+        yield from _iter_list_as_json_parallel(l, to_json, base_indent, indent, deep_str_limit, chunk_size, workers, executor)
+        return
+
+    yield "["
+    first = True
+    for l_item in l:
+        if first:
+            first = False
+            prefix = ""
+        else:
+            prefix = ","
+        if indent:
+            prefix += f"\n{' '*indent}"
+        if prefix:
+            yield prefix
+        yield from iter_to_json(l_item, base_indent = base_indent + indent, indent = indent, depth = 1)
+    if first:
+        yield "]"
+    else:
+        yield "\n]"
 
 def list_as_json(l: List, **kwargs) -> str:
     """
@@ -279,6 +1274,19 @@ def list_as_json(l: List, **kwargs) -> str:
               Signature: to_json(obj, base_indent, indent) -> str
             - base_indent (int): Base indentation level in spaces. Default: 0
             - indent (int): Indentation increment in spaces. Default: 2
+            - deep_str_limit (int | list, optional): Maximum length of string values at any depth,
+              or a list of limits per depth (see `json_str_limit`). Used when to_json is not given. Default: None
+            - max_bytes (int, optional): Maximum output size in bytes; the serialization stops early
+              and the output ends with a "...[truncated after N bytes]" marker
+              (N = max_bytes). Default: None
+            - parallel (bool): Format the list items in a worker pool, in chunks stitched back in order.
+              The output is the same as in the sequential mode. Default: False
+            - parallel_threshold (int): Minimum list length for the parallel mode to be used. Default: 20000
+            - workers (int): Number of pool workers in the parallel mode. Default: os.cpu_count()
+            - chunk_size (int): Number of list items per worker task in the parallel mode.
+              Default: len(l) / (4 * workers), at least 1000.
+            - executor (str): "process" or "thread" pool in the parallel mode; with "process",
+              the list items and to_json must be picklable. Default: "process"
 
     Returns:
         str: A formatted JSON string representation of the input.
@@ -294,33 +1302,25 @@ def list_as_json(l: List, **kwargs) -> str:
         'None'
         >>> list_as_json(42)
         '42'
+
+    Notes:
+        - See `iter_list_as_json` and `dump_list_as_json` for the streaming variants.
     """
 
-    to_json = getKwarg(kwargs, 'to_json', lambda obj, base_indent, indent: as_json(obj, base_indent = base_indent, indent = indent))
-    base_indent = getKwarg(kwargs, 'base_indent', 0)
-    indent = getKwarg(kwargs, 'indent', 2)
+    return "".join(iter_list_as_json(l, **kwargs))
 
-    if l is None:
-        return "None"
+def dump_list_as_json(l: List, fp: IO[str], **kwargs) -> None:
+    """
+    Write a list as a formatted JSON string to a file-like object.
+    Streaming variant of `list_as_json`: chunks are written as they are produced.
 
-    if not isinstance(l, list):
-        return to_json(l, base_indent = base_indent + indent, indent = indent)
+    Args:
+        l (List): The list to convert to JSON format. Can be None or a non-list object.
+        fp (IO[str]): A `.write()`-supporting file-like object (file, `io.StringIO`, socket `makefile('w')`, ...).
+        **kwargs: Optional keyword arguments, see `list_as_json`.
+    """
 
-    json_str = "["
-    first = True
-    for l_item in l:
-        if first:
-            first = False
-        else:
-            json_str += ","
-        if indent:
-            json_str += f"\n{' '*indent}"
-        json_str += f"{to_json(l_item, base_indent = base_indent + indent, indent = indent)}"
-    if first:                
-        json_str += "]"
-    else:
-        json_str += "\n]"
-    return json_str
+    fp.writelines(iter_list_as_json(l, **kwargs))
 
 def to_json(obj, indent = None) -> str:
     """
@@ -335,8 +1335,11 @@ def to_json(obj, indent = None) -> str:
 
     Returns:
         str: The JSON string representation of the object.   
+
+    Notes:
+        - Serializes with the selected JSON backend, see `json_dumps`.
     """
-    return json.dumps(obj, indent=indent, default=obj2JSON)
+    return json_dumps(obj, indent=indent)
 
 def to_json_pretty(obj) -> str:
     """
@@ -349,3 +1352,286 @@ def to_json_pretty(obj) -> str:
         str: The JSON string representation of the object with a default indentation of 2 spaces.   
     """
     return to_json(obj, indent=2)
+
+# ------------------------------------------------------------
+# Schema-specialized encoders
+
+class _JSONEncoderBuilder:
+    """
+    Generate the source of a compact JSON encoder specialized for a JSON schema.
+    Every object / array schema becomes a function, primitive values are encoded by inline type tests,
+    and any value not matching its schema is encoded by `_generic`.
+    """
+
+    def __init__(self, root: Dict):
+        self.root = root
+        self.functions = []     # function sources (lines), by index
+        self.names = {}         # $ref or schema JSON → function name
+
+    def _container(self, schema: Dict, ref: Optional[str] = None) -> str:
+        """Generate the function of an object / array schema. Return its name."""
+
+        key = ref if ref is not None else json.dumps(schema)
+        name = self.names.get(key)
+        if name is not None:
+            return name
+        index = len(self.functions)
+        name = self.names[key] = f"_encode_{index}"
+        # reserved before generating the body: recursive schemas call the function itself
+        self.functions.append(None)
+        self.functions[index] = self._container_lines(name, schema)
+        return name
+
+    def _container_cases(self, schema: Dict, var: str, ref: Optional[str] = None) -> List[tuple]:
+        t = schema.get("type")
+        if t == "array" and isinstance(schema.get("items"), dict) and schema["items"]:
+            return [(f"type({var}) in _array_types", f"{self._container(schema, ref)}({var})")]
+        if t == "object" and (schema.get("properties") or schema.get("additionalProperties")):
+            return [(f"type({var}) is dict", f"{self._container(schema, ref)}({var})")]
+        return []
+
+    def _cases(self, schema, var: str) -> List[tuple]:
+        """Return the (condition, expression) cases encoding a value of the schema."""
+
+        if not isinstance(schema, dict) or not schema:
+            return []
+
+        if "$ref" in schema:
+            ref = schema["$ref"]
+            if ref == "#":
+                target = self.root
+            elif ref.startswith("#/$defs/"):
+                target = self.root.get("$defs", {}).get(ref[len("#/$defs/"):])
+            else:
+                target = None
+            if not isinstance(target, dict):
+                return []
+            return self._container_cases(target, var, ref)
+
+        if "oneOf" in schema:
+            cases = []
+            for alternative in schema["oneOf"]:
+                cases.extend(self._cases(alternative, var))
+            return cases
+
+        t = schema.get("type")
+        if t == "null":
+            return [(f"{var} is None", "'null'")]
+        if t == "boolean":
+            return [(f"{var} is True", "'true'"), (f"{var} is False", "'false'")]
+        if t == "integer":
+            return [(f"type({var}) is int", f"_int_repr({var})")]
+        if t == "number":
+            # non-finite floats (NaN, Infinity) take the generic path
+            return [(f"type({var}) is float and {var} - {var} == 0.0", f"_float_repr({var})"),
+                    (f"type({var}) is int", f"_int_repr({var})")]
+        if t == "string":
+            return [(f"type({var}) is str", f"_encode_str({var})")]
+        return self._container_cases(schema, var)
+
+    def expr(self, schema, var: str) -> str:
+        """Return the expression encoding `var`: the first matching case, else the generic path."""
+
+        expr = f"_generic({var})"
+        for condition, case_expr in reversed(self._cases(schema, var)):
+            expr = f"{case_expr} if {condition} else {expr}"
+        return f"({expr})"
+
+    def _container_lines(self, name: str, schema: Dict) -> List[str]:
+        if schema.get("type") == "array":
+            return [
+                f"def {name}(v):",
+                f"    return '[' + ', '.join([{self.expr(schema['items'], 'x')} for x in v]) + ']'",
+            ]
+
+        properties = schema.get("properties") or {}
+        additional = schema.get("additionalProperties")
+        lines = [f"def {name}(v):"]
+        if properties:
+            # fixed shape: the known keys in the schema order, with pre-escaped key literals
+            values = [f"v{i}" for i in range(len(properties))]
+            parts = []
+            for i, (key, value_schema) in enumerate(properties.items()):
+                parts.append(repr(("{" if i == 0 else ", ") + json.encoder.encode_basestring_ascii(key) + ": "))
+                parts.append(self.expr(value_schema, values[i]))
+            parts.append("'}'")
+            lines += [
+                f"    if tuple(v) == {tuple(properties)!r}:",
+                f"        {', '.join(values)}, = v.values()",
+                f"        return ''.join(({', '.join(parts)}))",
+            ]
+        if isinstance(additional, dict) and additional:
+            # other keys: a map of additionalProperties values
+            lines += [
+                "    if all([type(k) is str for k in v]):",
+                f"        return '{{' + ', '.join([_encode_str(k) + ': ' + {self.expr(additional, 'x')} for k, x in v.items()]) + '}}'",
+            ]
+        lines.append("    return _generic(v)")
+        return lines
+
+    def source(self, root_expr: str) -> str:
+        functions = ["\n".join(lines) for lines in self.functions]
+        functions.append(f"def encode(obj):\n    return {root_expr}")
+        return "\n\n".join(functions) + "\n"
+
+def compile_json_encoder(schema: Dict, default: Callable = obj2JSON) -> Callable[[Any], str]:
+    """
+    Generate a compact JSON encoder specialized for records of a JSON schema
+    (as inferred by `pyutils.inspect_util.json_schema` or `json_lines_schema`).
+
+    Objects with the known keys in the schema order are written with pre-escaped key literals
+    and per-field type tests instead of the generic type dispatch; other key sets are written as maps
+    of the "additionalProperties" schema if any. Any value not matching its schema (other type, other keys,
+    non-finite float, ...) is serialized by the generic path (`json_dumps`), so the output is always
+    the same as `to_json(record)`.
+
+    Args:
+        schema (dict): The JSON schema of the records ("type", "properties", "additionalProperties",
+            "items", "oneOf" and "$ref" are used; {} or other schemas take the generic path).
+        default (callable, optional): Converter of objects that are not JSON-serializable. Defaults to obj2JSON.
+
+    Returns:
+        callable: The encoder, signature: encode(record) -> str. Its generated code is in `encode.source`.
+
+    Examples:
+        >>> encode = compile_json_encoder(json_schema(records[:100])["items"])
+        >>> lines = [encode(record) for record in records]
+
+    See: examples/json_util_schema_encoder_benchmark.py
+    """
+
+    builder = _JSONEncoderBuilder(schema)
+    source = builder.source(builder.expr(schema, "obj"))
+    namespace = {
+        "_generic": lambda obj: json_dumps(obj, default=default),
+        "_encode_str": json.encoder.encode_basestring_ascii,
+        "_int_repr": int.__repr__,
+        "_float_repr": float.__repr__,
+        "_array_types": (list, tuple),
+    }
+    exec(compile(source, "<compile_json_encoder>", "exec"), namespace)
+    encode = namespace["encode"]
+    encode.source = source
+    return encode
+
+# ------------------------------------------------------------
+# JSON Lines bulk writer
+
+class JSONLinesStats:
+    """
+    Throughput statistics of `write_json_lines`.
+
+    Attributes:
+        records (int): Number of records written.
+        chunks (int): Number of serialized chunks.
+        bytes (int): Number of bytes written (UTF-8).
+        seconds (float): Elapsed wall-clock time.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.chunks = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"JSONLinesStats(records={self.records}, chunks={self.chunks}, bytes={self.bytes}, seconds={self.seconds:.3f}, "
+                f"records/s={self.records_per_second:.0f}, MB/s={self.mb_per_second:.2f})")
+
+_json_encoders_cache = {}
+
+def _schema_json_encoder(schema: Dict, default: Callable) -> Callable:
+    """Return the compile_json_encoder() encoder of a schema, cached (e.g. per worker process)."""
+
+    key = (json.dumps(schema), default)
+    encode = _json_encoders_cache.get(key)
+    if encode is None:
+        encode = _json_encoders_cache[key] = compile_json_encoder(schema, default)
+    return encode
+
+def _json_lines_chunk(records: List, default: Callable = obj2JSON, schema: Optional[Dict] = None) -> str:
+    """Serialize a chunk of records to JSON Lines (one compact JSON document per line)."""
+
+    if schema is not None:
+        encode = _schema_json_encoder(schema, default)
+        return "".join([encode(record) + "\n" for record in records])
+    return "".join([json_dumps(record, default=default) + "\n" for record in records])
+
+def _json_lines_counted_chunk(records: List, default: Callable = obj2JSON, schema: Optional[Dict] = None) -> tuple:
+    return (len(records), _json_lines_chunk(records, default, schema))
+
+def write_json_lines(records: Iterable, fp, **kwargs) -> JSONLinesStats:
+    """
+    Write records as JSON Lines (NDJSON): one compact JSON document (as by `to_json`) per line.
+    Records are batched into chunks which are serialized in the calling thread (or in a thread / process pool)
+    and written in input order with large buffered writes.
+
+    Serialization is pure Python (GIL-bound), so by default it runs in the calling thread:
+    - "thread" overlaps serialization with the writes only; it scales on a free-threaded Python.
+    - "process" serializes in parallel, but pays the pickling of the records and of the output chunks:
+      it pays off for large chunks of expensive records only.
+
+    Args:
+        records (Iterable): The records to write. Consumed lazily.
+        fp (str | IO[str]): A file path, or a `.write()`-supporting file-like object.
+        **kwargs: Optional keyword arguments:
+            - default (callable): Converter of objects that are not JSON-serializable. Default: obj2JSON.
+              Must be picklable (a module-level function) with the process executor.
+            - chunk_size (int): Number of records per serialized chunk. Default: 1000.
+            - workers (int): Number of pool workers; 0 or 1 serializes in the calling thread. Default: os.cpu_count().
+            - executor (str): None (the calling thread), "thread" or "process".
+              With "process", records must be picklable. Default: None.
+            - buffer_size (int): Number of characters buffered before a write. Default: 1 MiB.
+            - append (bool): Append to the file when fp is a path. Default: False.
+            - schema (dict): JSON schema of the records: records are serialized by the specialized encoder
+              of `compile_json_encoder` (same output). Default: None.
+
+    Returns:
+        JSONLinesStats: Throughput statistics.
+
+    Raises:
+        ValueError: If the executor is unknown.
+    """
+
+    default = getKwarg(kwargs, 'default', obj2JSON)
+    chunk_size = getKwarg(kwargs, 'chunk_size', 1000)
+    workers = getKwarg(kwargs, 'workers', os.cpu_count() or 1)
+    executor = getKwarg(kwargs, 'executor', None)
+    buffer_size = getKwarg(kwargs, 'buffer_size', 1024 * 1024)
+    append = getKwarg(kwargs, 'append', False)
+    schema = getKwarg(kwargs, 'schema', None)
+
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, "a" if append else "w", encoding="utf-8", newline="\n", buffering=buffer_size) as f:
+            return write_json_lines(records, f, default = default, chunk_size = chunk_size, workers = workers,
+                                    executor = executor, buffer_size = buffer_size, schema = schema)
+
+    stats = JSONLinesStats()
+    start = time.perf_counter()
+
+    buffer = []
+    buffered = 0
+    for count, json_lines in _iter_pool_map(_json_lines_counted_chunk, _iter_chunks(records, chunk_size), workers, executor, default, schema):
+        stats.records += count
+        stats.chunks += 1
+        stats.bytes += len(json_lines) if json_lines.isascii() else len(json_lines.encode())
+        buffer.append(json_lines)
+        buffered += len(json_lines)
+        if buffered >= buffer_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        fp.write("".join(buffer))
+    fp.flush()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
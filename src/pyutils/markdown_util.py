@@ -2,7 +2,14 @@
 Markdown utilities.
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import itertools
+import os
 import re
+import threading
 
 MD_BLOCK_RE = re.compile(
     r"""
@@ -13,8 +20,247 @@ MD_BLOCK_RE = re.compile(
     re.DOTALL | re.VERBOSE
 )
 
+_FENCE_HEADER_RE = re.compile(r"\w*")
+_BLOCK_START_RE = re.compile(r"[`$]")
+
+class _BlockScanner:
+
+    """
+    Hand-written scanner of the MD_BLOCK_RE blocks, in linear time.
+
+    MD_BLOCK_RE backtracks over the rest of the text at every unclosed ``` or $$ (lazy .*? under re.DOTALL),
+    so malformed input is quadratic. The scanner tries the same alternatives at the same positions,
+    but every search of a closing delimiter is remembered and reused by the next candidates,
+    so each character is searched once per delimiter.
+    """
+
+    def __init__(self, md):
+        self.md = md
+        self._found = {}    # delimiter → (searched from, index found or -1)
+
+    def _find(self, delimiter, start):
+        searched = self._found.get(delimiter)
+        if searched is not None and searched[0] <= start and (searched[1] < 0 or searched[1] >= start):
+            return searched[1]
+        found = self.md.find(delimiter, start)
+        self._found[delimiter] = (start, found)
+        return found
+
+    def match(self, start):
+        """Return the (kind, start, end) block starting at md[start], or None (as MD_BLOCK_RE.match)."""
+
+        md = self.md
+        c = md[start]
+
+        if c == "`":
+            # ```(\w+)?\n.*?\n```
+            if not md.startswith("```", start):
+                return None
+            header_end = _FENCE_HEADER_RE.match(md, start + 3).end()
+            if header_end == len(md) or md[header_end] != "\n":
+                return None
+            close = self._find("\n```", header_end + 1)
+            if close < 0:
+                return None
+            return ("code", start, close + 4)
+
+        if c == "$":
+            if md.startswith("$$", start):
+                # \$\$.*?\$\$
+                close = self._find("$$", start + 2)
+                if close >= 0:
+                    return ("full_math", start, close + 2)
+                return None
+            # \$[^$\n]+\$
+            if start + 1 == len(md) or md[start + 1] == "\n":
+                return None
+            close = self._find("$", start + 1)
+            if close < 0:
+                return None
+            newline = self._find("\n", start + 1)
+            if 0 <= newline < close:
+                return None
+            return ("inline_math", start, close + 1)
+
+        return None
+
+    def search(self, pos):
+        """Return the first (kind, start, end) block at or after pos, or None (as MD_BLOCK_RE.search)."""
+
+        md = self.md
+        while True:
+            m = _BLOCK_START_RE.search(md, pos)
+            if m is None:
+                return None
+            block = self.match(m.start())
+            if block is not None:
+                return block
+            pos = m.start() + 1
+
+def iter_md_blocks(md):
+    """
+    Yield the code / math blocks of a markdown text as (kind, start, end), kind: "code" | "full_math" | "inline_math".
+    Same blocks as MD_BLOCK_RE.finditer(md), in linear time (unterminated blocks are text).
+    """
+
+    scanner = _BlockScanner(md)
+    pos = 0
+    while True:
+        block = scanner.search(pos)
+        if block is None:
+            return
+        yield block
+        pos = block[2]
+
 # ------------------------------------------------------------
 
+class BlockCache:
+
+    """
+    Bounded LRU cache of rendered markdown blocks, shared by renderers (and their threads).
+    Keys are hashes of the block type and content, prefixed by the renderer namespace (see namespace()),
+    values are the recorded output calls of the block rendering.
+    Entries are evicted in least recently used order when the cached bytes exceed max_bytes
+    (the output of a single block larger than max_bytes is not cached).
+
+    Attributes:
+        hits (int): Number of blocks replayed from the cache.
+        misses (int): Number of blocks rendered and cached.
+        evictions (int): Number of evicted entries.
+        bytes (int): Size of the cached output (characters of the recorded strings).
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = collections.OrderedDict()   # key → (output calls, size)
+        self._namespaces = {}                       # (renderer class, renders_map id, filter ids) → (prefix, renders_map, filters)
+        self._namespace_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def namespace(self, renderer):
+        """
+        Return the key prefix of a renderer: renderers share cached blocks only if they have the same class,
+        renders_map and filters (by identity; they must not be modified in place once cached).
+        """
+
+        ident = (type(renderer), id(renderer.renders_map), tuple(map(id, renderer.filters)))
+        entry = self._namespaces.get(ident)
+        if entry is None:
+            with self._lock:
+                entry = self._namespaces.get(ident)
+                if entry is None:
+                    # the renders_map and filters are kept alive: their ids are not reused
+                    prefix = next(self._namespace_ids).to_bytes(8, "little")
+                    entry = self._namespaces[ident] = (prefix, renderer.renders_map, tuple(renderer.filters))
+        return entry[0]
+
+    @staticmethod
+    def key(kind, content, namespace=b""):
+        return namespace + hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16, person=kind.encode()[:16]).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, calls):
+        size = len(key) + sum(len(arg) for _, args in calls for arg in args if isinstance(arg, str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (calls, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __reduce__(self):
+        # e.g. render_many(executor="process"): an empty cache per worker
+        return (self.__class__, (self.max_bytes,))
+
+    def __repr__(self):
+        return f"BlockCache(entries={len(self._entries)}, bytes={self.bytes}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+class _OutputRecorder:
+
+    """Proxy of a renderer's data recording the calls of its output methods (the other attributes pass through)."""
+
+    def __init__(self, data, output_methods):
+        self._data = data
+        self._output_methods = output_methods
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._data, name)
+        if name not in self._output_methods:
+            return attr
+        def record(*args):
+            self.calls.append((name, args))
+            return attr(*args)
+        return record
+
+class RenderContext:
+
+    """
+    Output state of a single render call: the data passed to the render functions.
+    Every call gets its own context, so one renderer (renders_map, filters, block cache) can serve many threads.
+    Subclasses add the output methods called by the render functions.
+    """
+
+    # methods receiving the rendered output (recorded for the block cache)
+    output_methods = ()
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+    def _apply_filters(self, md):
+        return self.renderer._apply_filters(md)
+
+    # Output state hooks (see IncrementalMarkdownRenderer)
+
+    def _close(self):
+        """End the document: flush the pending output (e.g. an open paragraph)."""
+
+    def _take_output(self):
+        """Return the output rendered so far, and clear it."""
+        return ""
+
+    def _output(self):
+        """Return the output rendered so far (not cleared)."""
+        return ""
+
+    def _fork(self):
+        """Return a new context continuing the pending output (e.g. an open paragraph), with no output rendered."""
+        return type(self)(self.renderer)
+
+    def _get_state(self):
+        return None
+
+    def _set_state(self, state):
+        pass
+
 class GroupMarkdownRenderer:
 
     """
@@ -24,80 +270,289 @@ class GroupMarkdownRenderer:
     - code
     - full math
     - inline math
+
+    Renderers with a context_class are reentrant: the render functions get a new RenderContext per call as data,
+    the renderer itself is not modified by rendering. Otherwise they get the data given to the constructor.
+
+    With a BlockCache, the output of a block is rendered once per (renderer namespace, block type, content)
+    and replayed afterwards (see BlockCache.namespace()):
+    the calls of the data output_methods made by the render function are recorded.
+    The render functions must then depend on the block content only.
     """
 
-    def __init__(self, renders_map, data, filters=[]):
+    # RenderContext subclass of the per-call data (None: the constructor data is shared by the calls)
+    context_class = None
+
+    # methods of the constructor data receiving the rendered output (recorded for the block cache)
+    output_methods = ()
+
+    def __init__(self, renders_map, data, filters=[], block_cache=None):
         self.renders_map = renders_map
         self.data = data
         self.filters = filters
+        self.block_cache = block_cache
 
-    def render_markdown(self, md):
+    def __call__(self, md):
+        return self.render(md)
+
+    def render(self, md):
+        """
+        Render a document. Thread-safe if the renderer has a context_class.
+
+        Returns:
+            The rendered output of the context, or None without context_class (the output is in the constructor data).
+        """
+
+        context = self._new_context()
+        if context is None:
+            self.render_markdown(md)
+            return None
+        self.render_markdown(md, context)
+        context._close()
+        return context._take_output()
+
+    async def arender(self, md, executor=None, offload_size=16 * 1024):
+        """
+        Render a document from a coroutine.
+        Documents of offload_size characters or more are rendered in an executor, not to block the event loop;
+        smaller ones are rendered in place (cheaper than the thread hand-off).
+
+        Args:
+            md (str): The markdown document.
+            executor (concurrent.futures.Executor, optional): The executor. Defaults to the loop default executor.
+            offload_size (int, optional): Minimum document length rendered in the executor. Defaults to 16 KiB.
+
+        Returns:
+            See render().
+        """
+
+        if len(md) < offload_size:
+            return self.render(md)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.render, md)
+
+    def _new_context(self):
+        return None if self.context_class is None else self.context_class(self)
+
+    def render_markdown(self, md, data=None, use_cache=True):
+        """Render md into data (defaults to the constructor data), through the block cache if use_cache."""
+
+        if data is None:
+            data = self.data
         pos = 0
-        for m in MD_BLOCK_RE.finditer(md):
-            if m.start() > pos:
-                self.renders_map["text"](md[pos:m.start()], self.data)
+        for kind, start, end in iter_md_blocks(md):
+            if start > pos:
+                self._render("text", md[pos:start], data, use_cache)
+
+            self._render_block(md, kind, start, end, data, use_cache)
 
-            if m.group("code"):
-                self.renders_map["code"](m.group("code"), self.data)
+            pos = end
 
-            elif m.group("full_math"):
-                self.renders_map["full_math"](m.group("full_math")[2:-2], self.data)
+        if pos < len(md):
+            self._render("text", md[pos:], data, use_cache)
 
-            elif m.group("inline_math"):
-                self.renders_map["inline_math"](m.group("inline_math")[1:-1], self.data)
+    def _render_block(self, md, kind, start, end, data, use_cache=True):
+        """Render a code / math block of md (see iter_md_blocks())."""
 
-            pos = m.end()
+        if kind == "code":
+            self._render("code", md[start:end], data, use_cache)
 
-        if pos < len(md):
-            self.renders_map["text"](md[pos:], self.data)
+        elif kind == "full_math":
+            self._render("full_math", md[start + 2:end - 2], data, use_cache)
+
+        elif kind == "inline_math":
+            self._render("inline_math", md[start + 1:end - 1], data, use_cache)
+
+    def _render(self, kind, content, data, use_cache=True):
+        """Render a block of a type, through the block cache if any."""
+
+        cache = self.block_cache if use_cache else None
+        output_methods = data.output_methods if isinstance(data, RenderContext) else self.output_methods
+        if cache is None or not output_methods:
+            self.renders_map[kind](content, data)
+            return
+
+        key = cache.key(kind, content, cache.namespace(self))
+        calls = cache.get(key)
+        if calls is None:
+            recorder = _OutputRecorder(data, output_methods)
+            self.renders_map[kind](content, recorder)
+            cache.put(key, recorder.calls)
+        else:
+            for name, args in calls:
+                getattr(data, name)(*args)
 
     def _apply_filters(self, md):
         for filter in self.filters:
             md = filter(md)
         return md
 
+    def render_many(self, docs, workers=None, executor=None, chunk_size=16):
+        """
+        Render a batch of documents (e.g. a whole chat history), in the calling thread or in a thread / process pool.
+
+        Renderers are pure Python, so by default the documents are rendered in the calling thread:
+        - "thread" renders in parallel only if the render functions release the GIL (e.g. a C syntax highlighter,
+          I/O) or on a free-threaded Python; the workers share this renderer, which must have a context_class.
+        - "process" renders in parallel, but pays the pickling of the renderer, documents and outputs:
+          it pays off for expensive render functions only. The renderer must be picklable.
+
+        Args:
+            docs (Iterable[str]): The markdown documents.
+            workers (int, optional): Number of pool workers; 0 or 1 renders in the calling thread. Defaults to os.cpu_count().
+            executor (str, optional): None (the calling thread), "thread" or "process". Defaults to None.
+            chunk_size (int, optional): Number of documents per task. Defaults to 16.
+
+        Returns:
+            list: The rendered documents, in input order.
+
+        Raises:
+            ValueError: If the executor is unknown.
+        """
+
+        docs = list(docs)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunks = [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+
+        if executor not in (None, "thread", "process"):
+            raise ValueError(f"Unknown executor: '{executor}'")
+        if executor is None or workers <= 1 or len(chunks) <= 1:
+            return _render_chunk(self, docs)
+
+        if executor == "process":
+            pool = concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(chunks)))
+
+        with pool:
+            results = pool.map(_render_chunk, itertools.repeat(self), chunks)
+            return [rendered for chunk in results for rendered in chunk]
+
+def _render_chunk(renderer, docs):
+    return [renderer.render(md) for md in docs]
+
 # ------------------------------------------------------------
 
 from pyutils.latex_util import latex_math_operands_to_html, latex_subscripts_to_html, latex_boxed_to_html
 
-class InlineMathMarkdown2HtmlRenderer(GroupMarkdownRenderer):
+class InlineMathMarkdown2HtmlContext(RenderContext):
 
     """
-    Markdown inline math renderer to HTML.
+    Output state of an InlineMathMarkdown2HtmlRenderer call.
     """
 
-    # TODO use MathJax or KaTeX for render latex (math) to html
+    output_methods = ("_add_paragraph", "_add_to_paragraph")
 
-    filters = [ latex_math_operands_to_html, latex_subscripts_to_html, latex_boxed_to_html ]
+    def __init__(self, renderer):
+        super().__init__(renderer)
+        self._html = []
+        self._paragraph = []
 
-    def __init__(self, renders_map, data):
-        super().__init__(renders_map, self, InlineMathMarkdown2HtmlRenderer.filters)
-        self.html = ""
-        self.paragraph = ""
+    # output in list buffers, joined once
+    @property
+    def html(self):
+        return "".join(self._html)
+
+    @property
+    def paragraph(self):
+        return "".join(self._paragraph)
 
     def _close_paragraph(self):
-        if self.paragraph:
-            self.html += "<p>" + self.paragraph + "</p>"
-            self.paragraph = ""
+        paragraph = "".join(self._paragraph)
+        if paragraph:
+            self._html.append("<p>" + paragraph + "</p>")
+        self._paragraph = []
 
     def _add_paragraph(self, html):
         self._close_paragraph()
-        self.html += html
+        self._html.append(html)
 
     def _add_to_paragraph(self, html):
-        self.paragraph += html
+        self._paragraph.append(html)
 
-    def __call__(self, md):
-        self.html = ""
-        self.paragraph = ""
-        super().render_markdown(md)
+    def _close(self):
         self._close_paragraph()
-        return self.html
+
+    def _take_output(self):
+        html = "".join(self._html)
+        self._html = []
+        return html
+
+    def _output(self):
+        return "".join(self._html)
+
+    def _fork(self):
+        context = super()._fork()
+        context._paragraph = list(self._paragraph)
+        return context
+
+    def _get_state(self):
+        # the buffers are only appended to (or replaced): their lengths are enough
+        return (len(self._html), self._paragraph, len(self._paragraph))
+
+    def _set_state(self, state):
+        html_len, self._paragraph, paragraph_len = state
+        del self._html[html_len:]
+        del self._paragraph[paragraph_len:]
+
+class InlineMathMarkdown2HtmlRenderer(GroupMarkdownRenderer):
+
+    """
+    Markdown inline math renderer to HTML.
+    The renders_map functions get an InlineMathMarkdown2HtmlContext as data.
+    """
+
+    # TODO use MathJax or KaTeX for render latex (math) to html
+
+    filters = [ latex_math_operands_to_html, latex_subscripts_to_html, latex_boxed_to_html ]
+
+    context_class = InlineMathMarkdown2HtmlContext
+
+    def __init__(self, renders_map, data=None, block_cache=None):
+        super().__init__(renders_map, None, InlineMathMarkdown2HtmlRenderer.filters, block_cache)
+
+    def __reduce__(self):
+        # e.g. render_many(executor="process"): the renders_map functions must be picklable
+        return (self.__class__, (self.renders_map, None, self.block_cache))
 
 # ------------------------------------------------------------
 
 from pyutils.latex_util import latex_math_operands_to_unicode, latex_subscripts_to_html, latex_boxed_to_md
 
+class InlineMathMarkdownContext(RenderContext):
+
+    """
+    Output state of an InlineMathMarkdownRenderer call.
+    """
+
+    output_methods = ("_add_rendered_markdown",)
+
+    def __init__(self, renderer):
+        super().__init__(renderer)
+        self._rendered_markdown = []
+
+    @property
+    def rendered_markdown(self):
+        return "".join(self._rendered_markdown)
+
+    def _add_rendered_markdown(self, md):
+        self._rendered_markdown.append(md)
+
+    def _take_output(self):
+        md = "".join(self._rendered_markdown)
+        self._rendered_markdown = []
+        return md
+
+    def _output(self):
+        return "".join(self._rendered_markdown)
+
+    def _get_state(self):
+        return len(self._rendered_markdown)
+
+    def _set_state(self, state):
+        del self._rendered_markdown[state:]
+
 class InlineMathMarkdownRenderer(GroupMarkdownRenderer):
 
     """
@@ -105,13 +560,10 @@ class InlineMathMarkdownRenderer(GroupMarkdownRenderer):
     """
 
     # NOTE Gradio Markdown renderer ignores CSS styles
-    
+
     #filters = [ latex_math_operands_to_unicode, latex_subscripts_to_html, latex_boxed_to_html ]
     filters = [ latex_math_operands_to_unicode, latex_subscripts_to_html, latex_boxed_to_md ]
 
-    def _add_rendered_markdown(self, md):
-        self.rendered_markdown += md
-
     renders_map = {
         "text": lambda md, data: data._add_rendered_markdown(md),
         "code": lambda md, data: data._add_rendered_markdown(md),
@@ -134,12 +586,302 @@ class InlineMathMarkdownRenderer(GroupMarkdownRenderer):
     # def getHTMLStyling():
     #     return f"<style>{InlineMathMarkdownRenderer.getCSS()}</style>"
 
-    def __init__(self):
-        super().__init__(InlineMathMarkdownRenderer.renders_map, self, InlineMathMarkdownRenderer.filters)
-        self.rendered_markdown = ""
+    context_class = InlineMathMarkdownContext
 
-    def __call__(self, md):
-        self.rendered_markdown = ""
-        super().render_markdown(md)
-        #return InlineMathMarkdownRenderer.getHTMLStyling() + self.rendered_markdown
-        return self.rendered_markdown
+    def __init__(self, block_cache=None):
+        super().__init__(InlineMathMarkdownRenderer.renders_map, None, InlineMathMarkdownRenderer.filters, block_cache)
+
+    def __reduce__(self):
+        return (self.__class__, (self.block_cache,))
+
+# ------------------------------------------------------------
+
+_INLINE_MATH_END_RE = re.compile(r"[$\n]")
+
+def _open_block(md, start):
+    """
+    Check whether a block may start at md[start] once more text is appended
+    (md[start:] is a proper prefix of a MD_BLOCK_RE match).
+
+    Returns:
+        tuple: (kind, resume) of the open block, where resume is the position to resume the search of its end
+               (None: check again from start), or None if no block can start there.
+    """
+
+    c = md[start]
+    n = len(md)
+
+    if c == "`":
+        if n - start < 3:
+            return ("fence", None) if md[start:] == "`" * (n - start) else None
+        if not md.startswith("```", start):
+            return None
+        header_end = _FENCE_HEADER_RE.match(md, start + 3).end()
+        if header_end == n:
+            return ("fence", None)
+        if md[header_end] != "\n":
+            return None
+        if md.find("\n```", header_end + 1) >= 0:
+            return None
+        return ("code", max(header_end + 1, n - 3))
+
+    if c == "$":
+        if start + 1 == n:
+            return ("dollar", None)
+        if md[start + 1] == "$":
+            if md.find("$$", start + 2) >= 0:
+                return None
+            return ("full_math", max(start + 2, n - 1))
+        return _open_inline_math(md, start + 1)
+
+    return None
+
+def _open_inline_math(md, resume):
+    if _INLINE_MATH_END_RE.search(md, resume):
+        return None
+    return ("inline_math", len(md))
+
+def _still_open(md, kind, resume):
+    """Resume the search of the end of an open block. Return the new resume position, or None if it is not open any more."""
+
+    n = len(md)
+    if kind == "code":
+        return None if md.find("\n```", resume) >= 0 else max(resume, n - 3)
+    if kind == "full_math":
+        return None if md.find("$$", resume) >= 0 else max(resume, n - 1)
+    if kind == "inline_math":
+        open_block = _open_inline_math(md, resume)
+        return None if open_block is None else open_block[1]
+    return None
+
+def _complete_lines_end(md):
+    """Return the position after the last line end of md followed by a character other than a line end (0 if none)."""
+
+    end = md.rfind("\n")
+    while end >= 0 and (end + 1 == len(md) or md[end + 1] == "\n"):
+        end = md.rfind("\n", 0, end)
+    return end + 1
+
+def _split_position(md, skip=-1):
+    """
+    Return a position of md up to its complete lines (see _complete_lines_end()) where md can be rendered in two parts,
+    whatever text is appended: no block spans it, and no block can start before it once more text is appended,
+    but at skip (the open block, which is text while open).
+    The parts are split between blocks, or at a line start of a text segment.
+    """
+
+    end = _complete_lines_end(md)
+    scanner = _BlockScanner(md)
+    pos = 0
+    while True:
+        m = _BLOCK_START_RE.search(md, pos, end)
+        if m is None:
+            return end
+        c = m.start()
+        block = scanner.match(c)
+        if block is not None:
+            if block[2] > end:
+                return c
+            pos = block[2]
+            continue
+        if c != skip and _open_block(md, c) is not None:
+            return max(md.rfind("\n", 0, c) + 1, pos)
+        pos = c + 1
+
+class IncrementalMarkdownRenderer:
+    """
+    Incremental rendering of a markdown stream (e.g. LLM output tokens) with a GroupMarkdownRenderer.
+
+    Appended chunks are scanned once: the blocks which cannot change any more are rendered (final output),
+    the rest is kept as the pending tail. Unclosed fences, $$ and $ are tracked as open blocks,
+    whose end is searched in the appended text only.
+    The concatenation of the final outputs and of finish() is the output of renderer(whole text).
+    The stream has its own RenderContext: streams (and render calls) can share the renderer.
+
+    The provisional rendering of the pending tail is incremental too: its complete lines are rendered once
+    (in a fork of the stream context), only the rest is rendered per feed(). It is the output of renderer(tail)
+    if the "text" render of a text segment is the concatenation of the renders of its lines
+    (e.g. escaping; parts are split at line starts, runs of blank lines are kept whole).
+    A fence or $$ which may still close after the open block keeps its lines pending.
+
+    Example:
+        stream = IncrementalMarkdownRenderer(InlineMathMarkdownRenderer())
+        rendered = ""
+        for token in tokens:
+            final, provisional = stream.feed(token)
+            rendered += final
+            show(rendered + provisional)
+        rendered += stream.finish()
+    """
+
+    def __init__(self, renderer):
+        """
+        Raises:
+            ValueError: If the renderer has no context_class.
+        """
+
+        self.renderer = renderer
+        self._context = renderer._new_context()
+        if self._context is None:
+            raise ValueError(f"{type(renderer).__name__} has no context_class")
+        self._parts = []        # pending text (not rendered yet), joined on demand (see _tail)
+        self._length = 0        # length of the pending text
+        self._checked = 0       # no block can start in _tail[:_checked] but at _open
+        self._open = None       # (start, kind, resume) of the first open block in _tail
+        self._preview = None    # [context, length] of the provisional rendering of _tail[:length]
+
+    @property
+    def _tail(self):
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def _set_tail(self, tail):
+        self._parts = [tail] if tail else []
+        self._length = len(tail)
+
+    def _suffix(self, length):
+        """Return the last length characters of the pending text (joining the last chunks only)."""
+
+        parts = self._parts
+        i, size = len(parts), 0
+        while size < length:
+            i -= 1
+            size += len(parts[i])
+        return "".join(parts[i:])[size - length:]
+
+    def feed(self, chunk, provisional=True):
+        """
+        Append a chunk of markdown.
+
+        Args:
+            chunk (str): The appended markdown.
+            provisional (bool, optional): Also render the pending tail. Defaults to True.
+
+        Returns:
+            tuple: (final, provisional): the newly finalized output, and the rendering of the pending tail
+                   as if the stream ended here ("" if provisional=False).
+        """
+
+        if not chunk:
+            final = ""
+        else:
+            self._parts.append(chunk)
+            self._length += len(chunk)
+            if not self._append_open(len(chunk)):
+                self._advance()
+            final = self._context._take_output()
+        if not provisional:
+            return final, ""
+        return final, self._render_tail()
+
+    def finish(self):
+        """End the stream. Return the output of the pending tail."""
+
+        context = self._context
+        self.renderer.render_markdown(self._tail, context)
+        context._close()
+        self._context = self.renderer._new_context()
+        self._set_tail("")
+        self._checked = 0
+        self._open = None
+        self._preview = None
+        return context._take_output()
+
+    def _render_tail(self):
+        if self._preview is None:
+            self._preview = [self._context._fork(), 0]
+        preview = self._preview
+        context, rendered = preview
+        renderer = self.renderer
+        md = self._suffix(self._length - rendered)
+
+        # provisional blocks change with every chunk: not cached
+        skip = self._open[0] - rendered if self._open is not None else -1
+        split = _split_position(md, skip)
+        if split:
+            renderer.render_markdown(md[:split], context, use_cache=False)
+            preview[1] += split
+            md = md[split:]
+
+        state = context._get_state()
+        try:
+            renderer.render_markdown(md, context, use_cache=False)
+            context._close()
+            return context._output()
+        finally:
+            context._set_state(state)
+
+    def _append_open(self, size):
+        """
+        Check the appended text (the last size characters of the tail) without rescanning the tail.
+        Return True if the tail state is known: no block can start in it, or the open block is still open.
+        """
+
+        if self._open is None:
+            if self._checked != self._length - size or _BLOCK_START_RE.search(self._parts[-1]):
+                return False
+            self._checked = self._length
+            return True
+
+        start, kind, resume = self._open
+        if resume is None:
+            return False
+        resume_at = _still_open(self._suffix(self._length - resume), kind, 0)
+        if resume_at is None:
+            return False
+        self._open = (start, kind, resume + resume_at)
+        return True
+
+    def _advance(self):
+        """Render the blocks which are final, keep the rest in the tail."""
+
+        md = self._tail
+        renderer = self.renderer
+        context = self._context
+        pos = 0
+        while True:
+            if self._open is not None:
+                start, kind, resume = self._open
+                if resume is not None:
+                    resume = _still_open(md, kind, resume)
+                    if resume is not None:
+                        self._open = (start, kind, resume)
+                        break
+                else:
+                    open_block = _open_block(md, start)
+                    if open_block is not None:
+                        self._open = (start, *open_block)
+                        break
+                # not open any more: look for a match / the next open block from there
+                self._open = None
+                self._checked = start
+
+            # no block can start in md[pos:_checked]
+            m = _BlockScanner(md).search(self._checked)
+            limit = m[1] if m else len(md)
+            for c in _BLOCK_START_RE.finditer(md, self._checked, limit):
+                open_block = _open_block(md, c.start())
+                if open_block is not None:
+                    self._open = (c.start(), *open_block)
+                    break
+            if self._open is not None:
+                break
+            if m is None:
+                self._checked = len(md)
+                break
+
+            # no block can start before m any more: m and the text before it are final
+            kind, start, end = m
+            if start > pos:
+                renderer._render("text", md[pos:start], context)
+            renderer._render_block(md, kind, start, end, context)
+            pos = self._checked = end
+
+        if pos:
+            self._set_tail(md[pos:])
+            self._preview = None
+            self._checked -= pos
+            if self._open is not None:
+                start, kind, resume = self._open
+                self._open = (start - pos, kind, None if resume is None else resume - pos)